@@ -0,0 +1,12 @@
+"""Jump Quest game logic, importable without pygame or Tk."""
+
+from .engine import (
+    GAME_OVER,
+    LEVEL_COMPLETE,
+    NO_INPUT,
+    GameState,
+    Inputs,
+    simulate,
+    step,
+)
+from .levels import get_level_properties, load_level
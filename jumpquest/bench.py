@@ -0,0 +1,217 @@
+"""Benchmark the cost of a frame across every level and resolution.
+
+Each level is loaded at each resolution with SDL's dummy video driver and
+driven by the same scripted inputs. The four parts of a frame - physics/AI
+update, collision pass, entity render and HUD - are timed separately and
+written as JSON. Given a baseline file that covers the same levels and
+frame count, any phase whose total got slower than the baseline by more
+than the threshold is reported and the run exits non-zero.
+
+Usage:
+    python -m jumpquest.bench [--frames N] [--levels FIRST-LAST]
+                              [--resolutions 720p,1080p,4k] [--output FILE]
+                              [--baseline FILE] [--threshold 0.15]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import pygame
+
+from .engine import GameState, Inputs, collision_phase, update_phase
+from .levels import MAX_LEVELS
+from .render import AnimationAtlas, DirtyRects, build_static_layer, draw_entities, draw_ui
+from .sprites import CharacterSpriteCache
+from .text import clear_text_cache
+from .timing import snapshot_positions
+
+PHASES = ("update", "collision", "render", "hud")
+RESOLUTIONS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+DEFAULT_FRAMES = 120
+DEFAULT_THRESHOLD = 0.15
+NOISE_FLOOR_MS = 0.005  # Differences smaller than this are timer noise
+
+
+def scripted_inputs(frame):
+    """Fixed input script: run right, double back now and then, keep jumping"""
+    return Inputs(frame % 120 >= 90, frame % 120 < 90, frame % 25 == 0, frame % 60 == 0)
+
+
+def summarize(samples):
+    """Mean and 95th percentile of a list of seconds, in milliseconds"""
+    ordered = sorted(samples)
+    mean = sum(ordered) / len(ordered)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {"mean_ms": mean * 1000, "p95_ms": p95 * 1000}
+
+
+def bench_level(window, sprites, atlas, level, width, height, frames):
+    """Time every phase of `frames` frames of one level"""
+    def load():
+        state = GameState(level, width, height)
+        return state, DirtyRects(build_static_layer(state), enabled=False)
+
+    state, dirty_rects = load()
+    timings = {phase: [] for phase in PHASES}
+    clock = time.perf_counter
+    for frame in range(frames):
+        inputs = scripted_inputs(frame)
+
+        start = clock()
+        px, py = update_phase(state, inputs)
+        updated = clock()
+        result = collision_phase(state, inputs, px, py)
+        collided = clock()
+        dirty_rects.restore(window)
+        player_pos, enemy_positions, guardian_pos, _ = snapshot_positions(state)
+        draw_entities(window, state, player_pos, enemy_positions, guardian_pos,
+                      sprites, atlas, "mario", dirty_rects)
+        rendered = clock()
+        draw_ui(window, state, level)
+        finished = clock()
+
+        timings["update"].append(updated - start)
+        timings["collision"].append(collided - updated)
+        timings["render"].append(rendered - collided)
+        timings["hud"].append(finished - rendered)
+
+        if result is not None:
+            # Keep measuring the same level (reloads come from the level cache)
+            state, dirty_rects = load()
+
+    return {phase: summarize(samples) for phase, samples in timings.items()}
+
+
+def run_benchmarks(levels, resolutions, frames):
+    """Benchmark every (resolution, level) pair and return the JSON-ready results"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    results = {}
+    totals = {}
+    try:
+        for name in resolutions:
+            width, height = RESOLUTIONS[name]
+            window = pygame.display.set_mode((width, height))
+            sprites = CharacterSpriteCache()
+            atlas = AnimationAtlas()
+            clear_text_cache()
+            results[name] = {}
+            totals[name] = dict.fromkeys(PHASES, 0.0)
+            for level in levels:
+                phases = bench_level(window, sprites, atlas, level, width, height, frames)
+                results[name][str(level)] = phases
+                for phase in PHASES:
+                    totals[name][phase] += phases[phase]["mean_ms"]
+                print(f"{name} level {level:>2}: " +
+                      "  ".join(f"{phase} {phases[phase]['mean_ms']:.3f} ms" for phase in PHASES))
+    finally:
+        pygame.quit()
+
+    return {
+        "frames": frames,
+        "levels": [levels[0], levels[-1]],
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": results,
+        "totals": totals,
+    }
+
+
+def baseline_mismatch(baseline, levels, frames):
+    """Why a run over levels with frames per level can't be compared with
+    baseline, or None if it can"""
+    if baseline.get("frames") != frames:
+        return f"it ran {baseline.get('frames')} frames per level, not {frames}"
+    if baseline.get("levels") != [levels[0], levels[-1]]:
+        first, last = baseline.get("levels", ["?", "?"])
+        return f"it covers levels {first}-{last}, not {levels[0]}-{levels[-1]}"
+    return None
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a list of regression messages (empty if nothing got slower).
+
+    Phases are compared by their total mean frame cost over all levels of a
+    resolution, which is much steadier than any single level, so both runs
+    must cover the same levels with the same frame count (ValueError if not).
+    """
+    problem = baseline_mismatch(baseline, current["levels"], current["frames"])
+    if problem:
+        raise ValueError(f"results can't be compared with the baseline: {problem}")
+    regressions = []
+    for name, phases in current["totals"].items():
+        base_phases = baseline.get("totals", {}).get(name)
+        if not base_phases:
+            continue
+        for phase, now in phases.items():
+            before = base_phases.get(phase)
+            if before is None:
+                continue
+            if now > before * (1 + threshold) and now - before > NOISE_FLOOR_MS:
+                regressions.append(f"{name} {phase}: {before:.3f} ms -> {now:.3f} ms "
+                                   f"(+{(now / before - 1) * 100:.0f}%, allowed {threshold * 100:.0f}%)")
+    return regressions
+
+
+def parse_levels(text):
+    """'12' -> [12], '1-50' -> [1, ..., 50]"""
+    first, _, last = text.partition("-")
+    return list(range(int(first), int(last or first) + 1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m jumpquest.bench",
+                                     description="Benchmark frame phases across levels and resolutions")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames per level")
+    parser.add_argument("--levels", type=parse_levels, default=list(range(1, MAX_LEVELS + 1)),
+                        help="level or range of levels, e.g. 1-50")
+    parser.add_argument("--resolutions", default=",".join(RESOLUTIONS),
+                        help="comma separated: " + ", ".join(RESOLUTIONS))
+    parser.add_argument("--output", default="bench_results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown per phase, 0.15 = 15%%")
+    args = parser.parse_args(argv)
+
+    resolutions = [name.strip() for name in args.resolutions.split(",") if name.strip()]
+    unknown = [name for name in resolutions if name not in RESOLUTIONS]
+    if unknown:
+        parser.error(f"unknown resolution(s): {', '.join(unknown)}")
+
+    baseline = None
+    if args.baseline:
+        # Checked up front so a mismatched baseline doesn't cost a whole run
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        problem = baseline_mismatch(baseline, args.levels, args.frames)
+        if problem:
+            parser.error(f"can't compare with {args.baseline}: {problem}")
+
+    current = run_benchmarks(args.levels, resolutions, args.frames)
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print("Performance regressions:")
+            for message in regressions:
+                print("  " + message)
+            return 1
+        print(f"No phase slower than {args.baseline} by more than {args.threshold * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Shared color palette"""
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GREEN = (0, 255, 0)
+YELLOW = (255, 255, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+ORANGE = (255, 165, 0)
+BROWN = (139, 69, 19)
+LIGHT_BLUE = (135, 206, 235)
+DARK_GREEN = (34, 139, 34)
+PINK = (255, 192, 203)
+LIGHT_GREEN = (144, 238, 144)
+DARK_RED = (139, 0, 0)
+BRIGHT_RED = (255, 50, 50)
+DEEP_RED = (220, 20, 60)
+GOLD = (255, 215, 0)
+DARK_GOLD = (184, 134, 11)
+PURPLE = (128, 0, 128)
+LIGHT_PURPLE = (221, 160, 221)
+SKIN = (255, 200, 150)
+
+# Menu palette
+MENU_BACKGROUND = (44, 62, 80)
+MENU_PANEL = (52, 73, 94)
+MENU_TEXT = (236, 240, 241)
+MENU_MUTED = (149, 165, 166)
+MENU_RED = (231, 76, 60)
+MENU_RED_ACTIVE = (192, 57, 43)
+MENU_GREEN = (39, 174, 96)
+MENU_GREEN_ACTIVE = (34, 153, 84)
+MENU_BLUE = (52, 152, 219)
+MENU_BLUE_ACTIVE = (41, 128, 185)
+MENU_PURPLE = (155, 89, 182)
+MENU_PURPLE_ACTIVE = (142, 68, 173)
+MENU_ORANGE = (243, 156, 18)
+MENU_ORANGE_ACTIVE = (211, 84, 0)
+MENU_SELECTED = (46, 204, 113)
@@ -0,0 +1,122 @@
+"""Endless mode: a side-scrolling world generated one screen-wide chunk at a time.
+
+Chunks come from a generator that lays out each screen with the same rules
+as the numbered levels (get_level_properties), getting one level harder
+every CHUNKS_PER_LEVEL screens. Only the chunks around the player are kept:
+new ones are loaded ahead of the player and old ones are dropped behind,
+so memory use and the cost of a frame stay flat however far the player
+runs.
+"""
+
+import random
+from collections import deque, namedtuple
+
+from .engine import MAX_HEALTH, GameState
+from .levels import DEFAULT_SEED, MAX_LEVELS, SEED_VERSION, get_level_properties, shifted
+
+ENDLESS_LEVEL = 0  # Level number endless runs are recorded under
+CHUNKS_PER_LEVEL = 3  # Screens per step of difficulty
+CHUNKS_BEHIND = 1  # Chunks kept behind the one the player is in
+CHUNKS_AHEAD = 2  # Chunks generated ahead of it
+START_X = 50  # Where the player starts
+PIXELS_PER_METRE = 50
+
+Chunk = namedtuple("Chunk", ["index", "left", "platforms", "obstacles", "coins", "health_pickups", "enemies",
+                             "background_color"])
+
+
+def chunk_rng(index, seed=DEFAULT_SEED):
+    """The RNG a chunk is generated from"""
+    return random.Random(f"{SEED_VERSION}:{seed}:{index}:chunk")
+
+
+def chunk_level(index):
+    """The level whose rules lay out a chunk"""
+    return min(MAX_LEVELS, 1 + index // CHUNKS_PER_LEVEL)
+
+
+def generate_chunk(index, width, height, seed=DEFAULT_SEED):
+    """Lay out the index-th screen of the world, in world coordinates"""
+    props = get_level_properties(chunk_level(index), width, height, chunk_rng(index, seed))
+    left = index * width
+    # The bucket and guardian are left out - endless mode has no goal
+    return Chunk(index, left, shifted(props['platforms'], left), shifted(props['obstacles'], left),
+                 shifted(props['coins'], left), shifted(props['health_pickups'], left),
+                 shifted(props['enemies'], left), props['background_color'])
+
+
+def chunk_stream(width, height, seed=DEFAULT_SEED):
+    """Yield the chunks of the world from left to right, forever"""
+    index = 0
+    while True:
+        yield generate_chunk(index, width, height, seed)
+        index += 1
+
+
+class EndlessState(GameState):
+    """GameState for an endless run: the world is streamed in around the player"""
+
+    endless = True
+
+    def __init__(self, width, height, health=MAX_HEALTH, seed=DEFAULT_SEED):
+        level_props = {
+            'platforms': [],
+            'obstacles': [],
+            'coins': [],
+            'health_pickups': [],
+            'enemies': [],
+            'bucket': None,
+            'guardian_enemy': None,
+            'background_color': None,
+        }
+        super().__init__(ENDLESS_LEVEL, width, height, health=health, seed=seed, level_props=level_props)
+        self.world_width = 0
+        self.furthest_x = START_X
+        self.chunks = deque()
+        self._stream = chunk_stream(width, height, seed)
+        self.update_world()
+        self.background_color = self.chunks[0].background_color
+
+    @property
+    def distance(self):
+        """Metres from the start to the furthest point reached"""
+        return (int(self.furthest_x) - START_X) // PIXELS_PER_METRE
+
+    def update_world(self):
+        """Load chunks ahead of the player and drop the ones far behind"""
+        current = int(self.player_x) // self.width
+        while self.world_width < (current + 1 + CHUNKS_AHEAD) * self.width:
+            self._load(next(self._stream))
+        while self.chunks[0].index < current - CHUNKS_BEHIND:
+            self._evict(self.chunks.popleft())
+        self.world_left = self.chunks[0].left
+        self.furthest_x = max(self.furthest_x, self.player_x)
+
+    def _load(self, chunk):
+        self.chunks.append(chunk)
+        self.platforms.extend(chunk.platforms)
+        self.obstacles.extend(chunk.obstacles)
+        self.coins.extend(chunk.coins)
+        self.health_pickups.extend(chunk.health_pickups)
+        for platform in chunk.platforms:
+            self.platform_grid.insert(platform, platform[0], platform[1], platform[2], platform[3])
+        for obstacle in chunk.obstacles:
+            self.obstacle_grid.insert(obstacle, obstacle[0], obstacle[1], obstacle[2], obstacle[3])
+        for coin in chunk.coins:
+            self.coin_grid.insert(coin, coin[0], coin[1], 20, 20)
+        for health_pickup in chunk.health_pickups:
+            self.pickup_grid.insert(health_pickup, health_pickup[0] - 15, health_pickup[1] - 15, 30, 30)
+        # Enemies patrol their own chunk
+        self.enemies.add(chunk.enemies, chunk.left, chunk.left + self.width)
+        self.world_width = chunk.left + self.width
+
+    def _evict(self, chunk):
+        for items, grid, evicted in ((self.platforms, self.platform_grid, chunk.platforms),
+                                     (self.obstacles, self.obstacle_grid, chunk.obstacles),
+                                     (self.coins, self.coin_grid, chunk.coins),
+                                     (self.health_pickups, self.pickup_grid, chunk.health_pickups)):
+            for item in evicted:
+                grid.remove(item)  # No-op for coins and hearts already picked up
+            evicted_ids = {id(item) for item in evicted}
+            items[:] = [item for item in items if id(item) not in evicted_ids]
+        self.enemies.remove_before(chunk.left + self.width)
@@ -0,0 +1,363 @@
+"""Headless Jump Quest simulation core.
+
+Everything in here is plain Python: no pygame, no Tk, no window. The game
+loop in ``pyjump adventure.py`` builds a ``GameState``, feeds it one
+``Inputs`` per frame through ``step()`` and draws whatever the state holds.
+"""
+
+from collections import namedtuple
+
+from .entities import EnemyStore
+from .levels import DEFAULT_SEED, enemy_seed, load_level
+from .spatial import SpatialHash
+
+# Game rules
+MAX_HEALTH = 100
+POWER_DURATION = 15 * 60  # 15 seconds (60 FPS)
+COINS_FOR_POWER = 5
+ENEMY_DAMAGE = 20
+GUARDIAN_DAMAGE = 30
+HEALTH_PICKUP_AMOUNT = 30
+INVINCIBLE_FRAMES = 60  # 1 second of invincibility
+COIN_SCORE = 10
+
+# Player properties
+PLAYER_WIDTH = 40
+PLAYER_HEIGHT = 50
+PLAYER_SPEED = 6  # Balanced speed
+GRAVITY = 1.0  # Increased gravity for even faster falling speed
+BORDER = 20  # Height of the upper border and the ground strip
+CAMERA_LEAD = 3  # The camera keeps the player a third of the way across the screen
+ACTIVE_MARGIN = 200  # Enemies this close to the view move every frame; the rest only now and then
+
+# Results returned by step()
+LEVEL_COMPLETE = "level_complete"
+GAME_OVER = "game_over"
+
+# One frame worth of player input
+Inputs = namedtuple("Inputs", ["left", "right", "jump", "power"])
+NO_INPUT = Inputs(False, False, False, False)
+
+
+def rects_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """Return True if two rectangles overlap (same rule as pygame.Rect.colliderect)"""
+    return ax < bx + bw and ay < by + bh and ax + aw > bx and ay + ah > by
+
+
+class GameState:
+    """All per-level game state: the player, the level layout and the counters.
+
+    The world spans world_left to world_width; for a normal level that is
+    exactly the screen, a level `screens` wide is that many screens side by
+    side. The bucket and the guardian may be None in worlds without a goal.
+    """
+
+    endless = False
+
+    def __init__(self, level, width, height, health=MAX_HEALTH, seed=DEFAULT_SEED, level_props=None, screens=1):
+        self.level = level
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.screens = screens
+
+        # Same (level, width, height, seed, screens) always gives the same level
+        if level_props is None:
+            level_props = load_level(level, width, height, seed, screens)
+        self.world_left = 0
+        self.world_width = level_props.get('world_width', width)
+        self.platforms = level_props['platforms']
+        self.obstacles = level_props['obstacles']
+        self.coins = level_props['coins']
+        self.health_pickups = level_props['health_pickups']
+        self.enemies = EnemyStore(level_props['enemies'], seed=enemy_seed(level, seed), max_x=self.world_width)
+        self.bucket = level_props['bucket']
+        self.guardian_enemy = level_props['guardian_enemy']
+        self.guardian_left = self.world_width - width  # The guardian patrols the last screen
+        self.background_color = level_props['background_color']
+
+        # Player properties
+        self.player_width = PLAYER_WIDTH
+        self.player_height = PLAYER_HEIGHT
+        self.player_x = 50
+        self.player_y = height - PLAYER_HEIGHT - 10
+        # Calculate jump_height so player can jump from ground to top border
+        max_jump_height = (height - BORDER - PLAYER_HEIGHT) - BORDER
+        self.jump_height = int((2 * max_jump_height / 0.5) ** 0.5)  # Derived from jump formula
+        self.is_jumping = False
+        self.jump_count = self.jump_height
+        self.on_ground = False
+
+        self.score = 0
+        self.health = health
+        self.invincible_timer = 0
+
+        # Power-up variables start fresh on every level
+        self.power_active = False
+        self.power_timer = 0
+        self.coins_collected = 0
+
+        self.frame = 0
+
+        self.build_spatial_index()
+
+    def build_spatial_index(self):
+        """Bucket every entity into broadphase grids for the collision pass.
+
+        Platforms, obstacles, coins and pickups never move, so they go in
+        once. Enemies live in an EnemyStore and are tested in one batch.
+        """
+        self.platform_grid = SpatialHash()
+        for platform in self.platforms:
+            self.platform_grid.insert(platform, platform[0], platform[1], platform[2], platform[3])
+        self.obstacle_grid = SpatialHash()
+        for obstacle in self.obstacles:
+            self.obstacle_grid.insert(obstacle, obstacle[0], obstacle[1], obstacle[2], obstacle[3])
+        self.coin_grid = SpatialHash()
+        for coin in self.coins:
+            self.coin_grid.insert(coin, coin[0], coin[1], 20, 20)
+        self.pickup_grid = SpatialHash()
+        for health_pickup in self.health_pickups:
+            self.pickup_grid.insert(health_pickup, health_pickup[0] - 15, health_pickup[1] - 15, 30, 30)
+
+    def update_world(self):
+        """Called at the start of every frame; worlds that stream their content override it"""
+
+
+def camera_x(state, player_x):
+    """Left edge of the view: follows the player, clamped to the world"""
+    x = int(player_x) - state.width // CAMERA_LEAD
+    return max(state.world_left, min(x, state.world_width - state.width))
+
+
+def move_player(state, inputs):
+    """Apply movement input, the jump arc and gravity"""
+    if inputs.left and state.player_x > state.world_left:
+        state.player_x -= PLAYER_SPEED
+    if inputs.right and state.player_x < state.world_width - state.player_width:
+        state.player_x += PLAYER_SPEED
+    if inputs.jump and not state.is_jumping and state.on_ground:
+        state.is_jumping = True
+        state.jump_count = state.jump_height
+
+    # Gravity and jumping
+    if state.is_jumping:
+        if state.jump_count >= -state.jump_height:
+            neg = 1
+            if state.jump_count < 0:
+                neg = -1
+            state.player_y -= (state.jump_count ** 2) * 0.5 * neg
+            state.jump_count -= 1
+        else:
+            state.is_jumping = False
+
+    # Apply gravity
+    if not state.is_jumping:
+        state.player_y += GRAVITY
+
+
+def collide_platforms(state):
+    """Land on, bump into or slide off platforms and the borders.
+
+    Returns the player box position (taken after gravity, before these
+    corrections) that the rest of the frame's collisions are tested with.
+    """
+    state.on_ground = False
+    px, py = int(state.player_x), int(state.player_y)
+    pw, ph = state.player_width, state.player_height
+    for platform in state.platform_grid.query(px, py, pw, ph):
+        if rects_overlap(px, py, pw, ph, platform[0], platform[1], platform[2], platform[3]):
+            if state.player_y < platform[1]:  # Landing on top of platform
+                state.player_y = platform[1] - ph
+                state.on_ground = True
+                state.is_jumping = False
+            elif state.player_y > platform[1] + platform[3]:  # Hitting platform from below
+                state.player_y = platform[1] + platform[3]
+            elif state.player_x < platform[0]:  # Hitting platform from left
+                state.player_x = platform[0] - pw
+            else:  # Hitting platform from right
+                state.player_x = platform[0] + platform[2]
+
+    # Ground collision
+    if state.player_y >= state.height - BORDER - ph:
+        state.player_y = state.height - BORDER - ph
+        state.on_ground = True
+        state.is_jumping = False
+
+    # Upper border collision
+    if state.player_y <= BORDER:
+        state.player_y = BORDER
+        state.is_jumping = False
+
+    return px, py
+
+
+def update_enemies(state):
+    """Move the enemies and the guardian one frame.
+
+    Enemies near the view move every frame; those further out than
+    ACTIVE_MARGIN get a coarser update every few frames instead.
+    """
+    if state.world_width - state.world_left > state.width:
+        active_left = camera_x(state, state.player_x) - ACTIVE_MARGIN
+        state.enemies.update(state.height, BORDER, active_left, active_left + state.width + 2 * ACTIVE_MARGIN,
+                             state.frame)
+    else:
+        state.enemies.update(state.height, BORDER)  # The whole world is in view
+
+    # Update guardian enemy
+    guardian_enemy = state.guardian_enemy
+    if guardian_enemy is not None:
+        guardian_enemy[0] += guardian_enemy[4]  # Move guardian
+        if guardian_enemy[0] <= state.guardian_left or guardian_enemy[0] >= state.world_width - guardian_enemy[2]:
+            guardian_enemy[4] *= -1  # Reverse direction
+
+
+def collide_obstacles(state, px, py):
+    """Push the player back out of obstacles"""
+    pw, ph = state.player_width, state.player_height
+    for obstacle in state.obstacle_grid.query(px, py, pw, ph):
+        if rects_overlap(px, py, pw, ph, obstacle[0], obstacle[1], obstacle[2], obstacle[3]):
+            # Push player back
+            if state.player_x < obstacle[0]:
+                state.player_x = obstacle[0] - pw
+            else:
+                state.player_x = obstacle[0] + obstacle[2]
+
+
+def collide_enemies(state, px, py):
+    """Take damage from enemies and the guardian; returns GAME_OVER on death"""
+    pw, ph = state.player_width, state.player_height
+    if state.invincible_timer <= 0 and not state.power_active:  # Only check damage if not powered up
+        # Regular enemies
+        for _ in range(state.enemies.count_hits(px, py, pw, ph)):
+            state.health -= ENEMY_DAMAGE
+            state.invincible_timer = INVINCIBLE_FRAMES
+            if state.health <= 0:
+                return GAME_OVER
+
+        # Guardian enemy (more damage)
+        guardian = state.guardian_enemy
+        if guardian is not None and rects_overlap(px, py, pw, ph, guardian[0], guardian[1], guardian[2], guardian[3]):
+            state.health -= GUARDIAN_DAMAGE
+            state.invincible_timer = INVINCIBLE_FRAMES
+            if state.health <= 0:
+                return GAME_OVER
+
+    # Update invincibility timer
+    if state.invincible_timer > 0:
+        state.invincible_timer -= 1
+    return None
+
+
+def collect_pickups(state, px, py):
+    """Pick up health hearts and coins under the player"""
+    pw, ph = state.player_width, state.player_height
+
+    # Collision with health pickups
+    for health_pickup in state.pickup_grid.query(px, py, pw, ph):
+        if rects_overlap(px, py, pw, ph, health_pickup[0] - 15, health_pickup[1] - 15, 30, 30):
+            state.health_pickups.remove(health_pickup)
+            state.pickup_grid.remove(health_pickup)
+            state.health = min(MAX_HEALTH, state.health + HEALTH_PICKUP_AMOUNT)
+
+    # Collision with coins
+    for coin in state.coin_grid.query(px, py, pw, ph):
+        if rects_overlap(px, py, pw, ph, coin[0], coin[1], 20, 20):
+            state.coins.remove(coin)
+            state.coin_grid.remove(coin)
+            state.score += COIN_SCORE
+            state.coins_collected += 1
+
+            # Enough coins for power-up (but don't activate automatically)
+            if state.coins_collected >= COINS_FOR_POWER:
+                state.coins_collected = COINS_FOR_POWER  # Cap at maximum
+
+
+def update_power(state, inputs):
+    """Activate the power-up on request and count it down"""
+    # Check for power activation
+    if inputs.power and state.coins_collected >= COINS_FOR_POWER and not state.power_active:
+        state.power_active = True
+        state.power_timer = POWER_DURATION
+        state.coins_collected = 0  # Reset coin counter
+
+    # Update power-up timer
+    if state.power_active:
+        state.power_timer -= 1
+        if state.power_timer <= 0:
+            state.power_active = False
+
+
+def reached_bucket(state, px, py):
+    """True if the player touches the golden bucket (level goal)"""
+    bucket = state.bucket
+    if bucket is None:
+        return False
+    return rects_overlap(px, py, state.player_width, state.player_height, bucket[0] - 15, bucket[1], 30, 25)
+
+
+def update_phase(state, inputs, lap=None):
+    """Physics and AI half of a frame: move the player and the enemies.
+
+    Returns the player box position for collision_phase(). ``lap``, if
+    given, is called with a phase name after each part (see profiler.py).
+    """
+    state.frame += 1
+    state.update_world()
+    if lap:
+        lap("world streaming")
+    move_player(state, inputs)
+    if lap:
+        lap("jump/gravity")
+    px, py = collide_platforms(state)
+    if lap:
+        lap("platform collision")
+    update_enemies(state)
+    if lap:
+        lap("enemy update")
+    return px, py
+
+
+def collision_phase(state, inputs, px, py, lap=None):
+    """Collision half of a frame; returns GAME_OVER, LEVEL_COMPLETE or None"""
+    collide_obstacles(state, px, py)
+    if lap:
+        lap("obstacle collision")
+    if collide_enemies(state, px, py) == GAME_OVER:
+        return GAME_OVER
+    if lap:
+        lap("enemy collision")
+    collect_pickups(state, px, py)
+    if lap:
+        lap("pickup/coin collision")
+    update_power(state, inputs)
+    result = LEVEL_COMPLETE if reached_bucket(state, px, py) else None
+    if lap:
+        lap("power/bucket")
+    return result
+
+
+def step(state, inputs, lap=None):
+    """Advance the game by one frame.
+
+    Returns GAME_OVER when the player runs out of health, LEVEL_COMPLETE when
+    the golden bucket is reached and None otherwise.
+    """
+    px, py = update_phase(state, inputs, lap)
+    return collision_phase(state, inputs, px, py, lap)
+
+
+def simulate(state, inputs, max_frames):
+    """Step the state headlessly until something happens or max_frames run out.
+
+    ``inputs`` is either a single Inputs used for every frame or a callable
+    taking the state and returning the Inputs for the next frame. Returns the
+    last step() result (None if the frame budget ran out first).
+    """
+    policy = inputs if callable(inputs) else (lambda _state: inputs)
+    for _ in range(max_frames):
+        result = step(state, policy(state))
+        if result is not None:
+            return result
+    return None
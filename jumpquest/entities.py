@@ -0,0 +1,165 @@
+"""Column-oriented enemy storage with vectorized movement and collision.
+
+Level generation still describes enemies as ``[x, y, w, h, speed, dir,
+move_type]`` lists. ``EnemyStore`` turns those into one NumPy array per
+field with an integer move-type code, so moving every enemy, bouncing them
+off the walls and testing them against the player are a handful of array
+operations however many enemies the level has.
+
+In levels wider than the screen only the enemies near the view move every
+frame. The rest take a step COARSE_INTERVAL times as long every
+COARSE_INTERVAL frames, which keeps their patrols going at a fraction of
+the cost.
+"""
+
+import numpy as np
+
+# Integer move-type codes
+STATIC = 0
+HORIZONTAL = 1
+VERTICAL = 2
+DYNAMIC = 3
+
+MOVE_TYPE_CODES = {
+    "static": STATIC,
+    "horizontal": HORIZONTAL,
+    "vertical": VERTICAL,
+    "dynamic": DYNAMIC,
+}
+
+COARSE_INTERVAL = 4  # Frames between the updates of enemies away from the view
+
+FIELDS = ("x", "y", "width", "height", "speed", "move_type", "min_x", "max_x")
+
+
+def _columns(enemies, min_x, max_x):
+    """Field arrays for a list of enemies patrolling between min_x and max_x"""
+    count = len(enemies)
+    return {
+        "x": np.array([enemy[0] for enemy in enemies], dtype=np.int64),
+        "y": np.array([enemy[1] for enemy in enemies], dtype=np.int64),
+        "width": np.array([enemy[2] for enemy in enemies], dtype=np.int64),
+        "height": np.array([enemy[3] for enemy in enemies], dtype=np.int64),
+        "speed": np.array([enemy[4] for enemy in enemies], dtype=np.int64),
+        # Enemies without a move type move horizontally
+        "move_type": np.array([MOVE_TYPE_CODES[enemy[6]] if len(enemy) > 6 else HORIZONTAL for enemy in enemies],
+                              dtype=np.int8),
+        "min_x": np.full(count, min_x, dtype=np.int64),
+        "max_x": np.full(count, max_x, dtype=np.int64),
+    }
+
+
+class EnemyStore:
+    """Every enemy of a level, one array per field.
+
+    Each enemy bounces between its own side walls (min_x, max_x): the level
+    edges for a normal level, its chunk's edges in endless mode.
+    ``generation`` goes up whenever enemies are added or removed, so index i
+    only refers to the same enemy while it stays the same.
+    """
+
+    def __init__(self, enemies, seed=None, min_x=0, max_x=0):
+        for field, column in _columns(enemies, min_x, max_x).items():
+            setattr(self, field, column)
+        self.rng = np.random.default_rng(seed)
+        self.generation = 0
+        self._classify()
+
+    def add(self, enemies, min_x, max_x):
+        """Append enemies that patrol between min_x and max_x"""
+        for field, column in _columns(enemies, min_x, max_x).items():
+            setattr(self, field, np.concatenate((getattr(self, field), column)))
+        self.generation += 1
+        self._classify()
+
+    def remove_before(self, x):
+        """Drop every enemy whose patrol area ends at or left of x"""
+        keep = self.max_x > x
+        if not keep.all():
+            for field in FIELDS:
+                setattr(self, field, getattr(self, field)[keep])
+            self.generation += 1
+            self._classify()
+
+    def _classify(self):
+        """Cache which enemies move how (move types never change mid-level)"""
+        self.horizontal = np.flatnonzero(self.move_type == HORIZONTAL)
+        self.vertical = np.flatnonzero(self.move_type == VERTICAL)
+        self.dynamic = np.flatnonzero(self.move_type == DYNAMIC)
+
+    def __len__(self):
+        return len(self.x)
+
+    def update(self, height, border, active_left=None, active_right=None, frame=0):
+        """Move the enemies one frame, bouncing off the walls and borders.
+
+        Enemies outside active_left..active_right only move on every
+        COARSE_INTERVAL-th frame, by that many frames' worth at once.
+        """
+        x, y, speed = self.x, self.y, self.speed
+        min_x, max_x = self.min_x, self.max_x
+
+        horizontal, vertical, dynamic = self.horizontal, self.vertical, self.dynamic
+        steps = speed
+        if active_left is not None:
+            near = (x + self.width > active_left) & (x < active_right)
+            if not near.all():
+                if frame % COARSE_INTERVAL == 0:
+                    steps = speed * np.where(near, 1, COARSE_INTERVAL)
+                else:
+                    horizontal, vertical, dynamic = (idx[near[idx]] for idx in (horizontal, vertical, dynamic))
+
+        # Horizontal: move, turn back at the side walls
+        idx = horizontal
+        if len(idx):
+            x[idx] += steps[idx]
+            self._bounce(x, idx, min_x[idx], max_x[idx] - self.width[idx])
+
+        # Vertical: move, turn back at the upper border and the ground
+        idx = vertical
+        if len(idx):
+            y[idx] += steps[idx]
+            self._bounce(y, idx, border, height - border - self.height[idx])
+
+        # Dynamic zigzag: move horizontally, step up or down at random
+        idx = dynamic
+        if len(idx):
+            step = steps[idx]
+            x[idx] += step
+            y[idx] += np.where(self.rng.integers(0, 2, size=len(idx)) == 0, step, -step)
+            bottom = height - border - self.height[idx]
+            bounce_y = (y[idx] <= border) | (y[idx] >= bottom)
+            y[idx] = np.clip(y[idx], border, bottom)
+            # A border reverses the zigzag unless a side wall turns it this frame
+            bounce_x = self._bounce(x, idx, min_x[idx], max_x[idx] - self.width[idx])
+            speed[idx[bounce_y & ~bounce_x]] *= -1
+
+    def _bounce(self, position, idx, low, high):
+        """Turn enemies idx that reached low or high back into that range.
+
+        An enemy that moved past a limit (a coarse step can overshoot by
+        several frames' worth) is put back on it, and its speed points away
+        from it rather than being negated - negating would flip it every
+        frame while it is still out of range. Returns the mask of those that
+        bounced.
+        """
+        pos = position[idx]
+        at_low = pos <= low
+        at_high = pos >= high
+        position[idx] = np.clip(pos, low, high)
+        speed = self.speed
+        speed[idx[at_low]] = np.abs(speed[idx[at_low]])
+        speed[idx[at_high]] = -np.abs(speed[idx[at_high]])
+        return at_low | at_high
+
+    def count_hits(self, px, py, pw, ph):
+        """Number of enemies overlapping the player box"""
+        if not len(self.x):
+            return 0
+        hits = ((self.x < px + pw) & (self.y < py + ph) &
+                (self.x + self.width > px) & (self.y + self.height > py))
+        return int(np.count_nonzero(hits))
+
+    def positions(self):
+        """Copy of the current enemy positions as (xs, ys)"""
+        return self.x.copy(), self.y.copy()
@@ -0,0 +1,399 @@
+"""Gym-style environments for training and evaluating automated players.
+
+``JumpQuestEnv`` wraps one headless GameState in the usual reset()/step()
+interface: an action is the same LEFT/RIGHT/SPACE/P bitmask recordings use
+(0-15), an observation is a fixed-size float32 vector describing the player
+and what is around it, and step() returns (observation, reward, terminated,
+truncated, info). No window or pygame is involved.
+
+``VectorEnv`` steps many of them in lock-step across a pool of worker
+processes. Actions, observations, rewards and done flags live in shared
+memory, so a step costs each worker one short message however many
+environments it owns. Finished episodes are reset automatically; their
+final info comes back in the step's info list.
+
+Environments keep generated levels in memory only (unless created with
+disk_cache=True), so resetting with fresh seeds never fills level_cache/.
+
+Usage: python -m jumpquest.env [--envs N] [--workers N] [--steps N] [--level N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .endless import ENDLESS_LEVEL, EndlessState
+from .engine import (
+    COINS_FOR_POWER,
+    GAME_OVER,
+    INVINCIBLE_FRAMES,
+    LEVEL_COMPLETE,
+    MAX_HEALTH,
+    POWER_DURATION,
+    GameState,
+    step,
+)
+from .levels import DEFAULT_SEED, load_level
+from .replay import decode_inputs
+
+NUM_ACTIONS = 16  # Every combination of the four input bits
+DEFAULT_SIZE = (1280, 720)
+MAX_EPISODE_STEPS = 120 * 60  # Two minutes of game time
+
+# Nearby entities in each observation (closest first, zero-padded)
+NEAREST_ENEMIES = 4
+NEAREST_PLATFORMS = 4
+NEAREST_OBSTACLES = 2
+NEAREST_COINS = 2
+PLAYER_FEATURES = 10
+OBS_SIZE = (PLAYER_FEATURES + 2 + 2 + NEAREST_ENEMIES * 3 + NEAREST_PLATFORMS * 3 + NEAREST_OBSTACLES * 4 +
+            NEAREST_COINS * 2)
+
+# Reward shaping
+SCORE_REWARD = 0.1  # Per point of score (1 per coin)
+PROGRESS_REWARD = 0.01  # Per pixel further right than ever before this episode
+DAMAGE_PENALTY = 0.05  # Per point of health lost
+COMPLETE_REWARD = 100.0
+DEATH_PENALTY = 10.0
+
+
+def write_nearest(obs, start, rows, px, py, count, scale):
+    """Write the `count` rows of (x, y, *features) nearest to (px, py) into obs.
+
+    Rows go in closest first from index start, with x and y made relative to
+    (px, py) and every column divided by its entry in scale.
+    """
+    if not len(rows):
+        return
+    distance = np.abs(rows[:, 0] - px) + np.abs(rows[:, 1] - py)
+    if len(rows) > count:
+        order = np.argpartition(distance, count)[:count]
+        order = order[np.argsort(distance[order], kind="stable")]
+    else:
+        order = np.argsort(distance, kind="stable")
+    near = rows[order]
+    near[:, 0] -= px
+    near[:, 1] -= py
+    near /= scale
+    obs[start:start + near.size] = near.ravel()
+
+
+class JumpQuestEnv:
+    """One level (or endless run) as a reset()/step() environment"""
+
+    def __init__(self, level=1, width=DEFAULT_SIZE[0], height=DEFAULT_SIZE[1], seed=DEFAULT_SEED, screens=1,
+                 max_steps=MAX_EPISODE_STEPS, disk_cache=False):
+        self.level = level
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.screens = screens
+        self.max_steps = max_steps
+        self.disk_cache = disk_cache  # Also cache generated levels in level_cache/ (pays off for fixed seeds)
+        self.state = None
+        # What each column of the nearest-entity rows is divided by
+        self._enemy_scale = np.array((width, height, 1), dtype=np.float32)
+        self._platform_scale = np.array((width, height, width), dtype=np.float32)
+        self._obstacle_scale = np.array((width, height, width, height), dtype=np.float32)
+        self._coin_scale = np.array((width, height), dtype=np.float32)
+
+    def reset(self, seed=None):
+        """Start a new episode (with a new seed if given) and return (observation, info)"""
+        if seed is not None:
+            self.seed = seed
+        if self.level == ENDLESS_LEVEL:
+            self.state = EndlessState(self.width, self.height, seed=self.seed)
+        else:
+            level_props = load_level(self.level, self.width, self.height, self.seed, self.screens,
+                                     disk_cache=self.disk_cache)
+            self.state = GameState(self.level, self.width, self.height, seed=self.seed, level_props=level_props,
+                                   screens=self.screens)
+        self.furthest_x = self.state.player_x
+        self._world_key = None
+        return self.observe(), {"seed": self.seed}
+
+    def _world_arrays(self):
+        """Platform, obstacle and coin rows for write_nearest(), rebuilt only when they change.
+
+        Platforms and obstacles only change when an endless run streams a
+        chunk in or out; coins also when one is picked up.
+        """
+        state = self.state
+        key = (state.world_left, state.world_width, len(state.coins))
+        if key != self._world_key:
+            self._world_key = key
+            platforms = np.array(state.platforms, dtype=np.float32).reshape(-1, 4)
+            obstacles = np.array(state.obstacles, dtype=np.float32).reshape(-1, 4)
+            coins = np.array(state.coins, dtype=np.float32).reshape(-1, 2)
+            # Top-centre and width of platforms, centre and size of obstacles, centre of coins
+            self._platforms = np.column_stack((platforms[:, 0] + platforms[:, 2] / 2, platforms[:, 1],
+                                               platforms[:, 2]))
+            self._obstacles = np.column_stack((obstacles[:, 0] + obstacles[:, 2] / 2,
+                                               obstacles[:, 1] + obstacles[:, 3] / 2, obstacles[:, 2:4]))
+            self._coins = coins + 10
+        return self._platforms, self._obstacles, self._coins
+
+    def step(self, action):
+        """Advance one frame; returns (observation, reward, terminated, truncated, info)"""
+        reward, terminated, truncated, info = self._advance(action)
+        return self.observe(), reward, terminated, truncated, info
+
+    def _advance(self, action):
+        """step() without building the observation"""
+        state = self.state
+        score, health = state.score, state.health
+        result = step(state, decode_inputs(int(action))[0])
+
+        reward = (state.score - score) * SCORE_REWARD - max(0, health - state.health) * DAMAGE_PENALTY
+        if state.player_x > self.furthest_x:
+            reward += (state.player_x - self.furthest_x) * PROGRESS_REWARD
+            self.furthest_x = state.player_x
+        if result == LEVEL_COMPLETE:
+            reward += COMPLETE_REWARD
+        elif result == GAME_OVER:
+            reward -= DEATH_PENALTY
+
+        terminated = result is not None
+        truncated = not terminated and state.frame >= self.max_steps
+        info = {"result": result, "score": state.score, "frames": state.frame}
+        return reward, terminated, truncated, info
+
+    def observe(self, out=None):
+        """The observation vector of the current state (written into `out` if given)"""
+        state = self.state
+        if out is None:
+            obs = np.zeros(OBS_SIZE, dtype=np.float32)
+        else:
+            obs = out
+            obs.fill(0)
+        width, height = float(self.width), float(self.height)
+        px = state.player_x + state.player_width / 2
+        py = state.player_y + state.player_height / 2
+
+        obs[0:PLAYER_FEATURES] = (
+            (state.player_x - state.world_left) / (state.world_width - state.world_left),
+            state.player_y / height,
+            state.on_ground,
+            state.is_jumping,
+            state.jump_count / state.jump_height,
+            state.health / MAX_HEALTH,
+            state.power_active,
+            state.power_timer / POWER_DURATION,
+            state.coins_collected / COINS_FOR_POWER,
+            state.invincible_timer / INVINCIBLE_FRAMES,
+        )
+        i = PLAYER_FEATURES
+        if state.bucket is not None:
+            obs[i:i + 2] = ((state.bucket[0] - px) / width, (state.bucket[1] - py) / height)
+        i += 2
+        if state.guardian_enemy is not None:
+            guardian = state.guardian_enemy
+            obs[i:i + 2] = ((guardian[0] - px) / width, (guardian[1] - py) / height)
+        i += 2
+
+        # Enemies: offset of the centre and a "there is one" flag
+        enemies = state.enemies
+        rows = np.ones((len(enemies), 3), dtype=np.float32)
+        rows[:, 0] = enemies.x + enemies.width / 2
+        rows[:, 1] = enemies.y + enemies.height / 2
+        write_nearest(obs, i, rows, px, py, NEAREST_ENEMIES, self._enemy_scale)
+        i += NEAREST_ENEMIES * 3
+
+        platforms, obstacles, coins = self._world_arrays()
+        # Platforms: offset of the top-centre and width
+        write_nearest(obs, i, platforms, px, py, NEAREST_PLATFORMS, self._platform_scale)
+        i += NEAREST_PLATFORMS * 3
+        # Obstacles: offset of the centre and size
+        write_nearest(obs, i, obstacles, px, py, NEAREST_OBSTACLES, self._obstacle_scale)
+        i += NEAREST_OBSTACLES * 4
+        # Coins: offset of the centre
+        write_nearest(obs, i, coins, px, py, NEAREST_COINS, self._coin_scale)
+        return obs
+
+
+def _attach(name, shape, dtype):
+    """A NumPy view of a shared memory block (and the block, to keep it alive)"""
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _worker(conn, names, first, env_kwargs):
+    """Run envs first..first+len(env_kwargs)-1 of a VectorEnv, one command at a time"""
+    blocks = []
+    views = {}
+    for key, (name, shape, dtype) in names.items():
+        block, view = _attach(name, shape, dtype)
+        blocks.append(block)
+        views[key] = view
+    obs, rewards, terminated, truncated, actions = (views[key] for key in
+                                                     ("obs", "rewards", "terminated", "truncated", "actions"))
+    envs = [JumpQuestEnv(**kwargs) for kwargs in env_kwargs]
+    indices = range(first, first + len(envs))
+    try:
+        while True:
+            command, arg = conn.recv()
+            if command == "step":
+                finished = []
+                for i, env in zip(indices, envs):
+                    reward, done, cut, info = env._advance(actions[i])
+                    rewards[i] = reward
+                    terminated[i] = done
+                    truncated[i] = cut
+                    if done or cut:
+                        finished.append((i, info))
+                        env.reset()
+                    env.observe(obs[i])
+                conn.send(finished)
+            elif command == "reset":
+                infos = []
+                for i, env in zip(indices, envs):
+                    _, info = env.reset(None if arg is None else arg[i])
+                    env.observe(obs[i])
+                    infos.append(info)
+                conn.send(infos)
+            else:  # "close"
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del obs, rewards, terminated, truncated, actions, views
+        for block in blocks:
+            block.close()
+        conn.close()
+
+
+class VectorEnv:
+    """`num_envs` JumpQuestEnvs stepped together across worker processes.
+
+    Each environment gets its own seed (``seeds``, or ``seed + i``) and
+    ``level`` may be one level for all or one per environment. Observations
+    come back as a (num_envs, OBS_SIZE) array.
+    """
+
+    def __init__(self, num_envs, level=1, seed=DEFAULT_SEED, seeds=None, workers=None, **env_kwargs):
+        self.num_envs = num_envs
+        env_levels = list(level) if isinstance(level, (list, tuple)) else [level] * num_envs
+        seeds = list(seeds) if seeds is not None else [seed + i for i in range(num_envs)]
+        if len(env_levels) != num_envs or len(seeds) != num_envs:
+            raise ValueError("need one level and one seed per environment")
+        workers = max(1, min(num_envs, workers or os.cpu_count() or 1))
+
+        layout = {
+            "obs": ((num_envs, OBS_SIZE), np.float32),
+            "rewards": ((num_envs,), np.float32),
+            "terminated": ((num_envs,), np.bool_),
+            "truncated": ((num_envs,), np.bool_),
+            "actions": ((num_envs,), np.uint8),
+        }
+        self._blocks = []
+        names = {}
+        for key, (shape, dtype) in layout.items():
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            self._blocks.append(block)
+            setattr(self, "_" + key, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+            names[key] = (block.name, shape, dtype)
+
+        # Split the environments into one contiguous slice per worker
+        self._conns = []
+        self._processes = []
+        bounds = np.linspace(0, num_envs, workers + 1).astype(int)
+        for first, stop in zip(bounds[:-1], bounds[1:]):
+            kwargs = [dict(env_kwargs, level=env_levels[i], seed=seeds[i]) for i in range(first, stop)]
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, args=(child, names, int(first), kwargs),
+                                              daemon=True, name=f"jumpquest-env-{first}")
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+        self.closed = False
+
+    def reset(self, seeds=None):
+        """Reset every environment; returns (observations, infos)"""
+        for conn in self._conns:
+            conn.send(("reset", seeds))
+        infos = []
+        for conn in self._conns:
+            infos.extend(conn.recv())
+        return self._obs.copy(), infos
+
+    def step(self, actions):
+        """Step every environment with its action.
+
+        Returns (observations, rewards, terminated, truncated, infos). infos
+        holds the final info of each episode that ended, as (index, info);
+        those environments have already been reset and their observation is
+        the first of the next episode.
+        """
+        self._actions[:] = actions
+        for conn in self._conns:
+            conn.send(("step", None))
+        infos = []
+        for conn in self._conns:
+            infos.extend(conn.recv())
+        return self._obs.copy(), self._rewards.copy(), self._terminated.copy(), self._truncated.copy(), infos
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+        del self._obs, self._rewards, self._terminated, self._truncated, self._actions
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        if not getattr(self, "closed", True):
+            self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m jumpquest.env",
+                                     description="Measure vectorized environment throughput with random actions")
+    parser.add_argument("--envs", type=int, default=os.cpu_count() or 1, help="number of environments")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--steps", type=int, default=2000, help="steps per environment")
+    parser.add_argument("--level", type=int, default=1, help=f"level to play ({ENDLESS_LEVEL} for endless)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    with VectorEnv(args.envs, level=args.level, workers=args.workers) as envs:
+        envs.reset()
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            _, _, _, _, infos = envs.step(rng.integers(0, NUM_ACTIONS, size=args.envs))
+            episodes += len(infos)
+        elapsed = time.perf_counter() - start
+    total = args.envs * args.steps
+    print(f"{total} steps in {elapsed:.2f} s: {total / elapsed:,.0f} steps/s "
+          f"({args.envs} envs, {len(envs._processes)} workers, {episodes} episodes finished)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""Deterministic, cached level generation.
+
+Every level is generated from its own RNG seeded by (level, seed), so the
+same (level, width, height, seed) always produces the same layout. Results
+are kept in an in-memory LRU backed by JSON files on disk, so revisiting a
+level or restarting after death never generates it again.
+
+A level may also be several screens wide: each screen is laid out by the
+same rules and they are placed side by side, with the bucket and its
+guardian on the last one.
+"""
+
+import copy
+import functools
+import json
+import os
+import random
+
+from .storage import write_json
+
+MAX_LEVELS = 50
+DEFAULT_SEED = 0
+
+# Part of every RNG seed string - bumping it re-rolls every level and
+# endless chunk (and the outcomes pinned in the tests), so leave it alone
+# unless that is the point
+SEED_VERSION = 1
+# Bump whenever get_level_properties() changes so stale disk entries are ignored
+CACHE_VERSION = 2
+LEVEL_CACHE_SIZE = 64
+LEVEL_CACHE_DIR = "level_cache"  # Set to None to keep the cache in memory only
+
+
+def level_rng(level, seed=DEFAULT_SEED, screen=0):
+    """The RNG a level (or one screen of a wide level) is generated from"""
+    if screen:
+        return random.Random(f"{SEED_VERSION}:{seed}:{level}:layout:{screen}")
+    return random.Random(f"{SEED_VERSION}:{seed}:{level}:layout")
+
+
+def enemy_seed(level, seed=DEFAULT_SEED):
+    """Seed for the in-game enemy randomness of a level"""
+    return random.Random(f"{SEED_VERSION}:{seed}:{level}:enemies").getrandbits(64)
+
+
+def get_level_properties(level, width, height, rng):
+    """Generate level properties based on level number"""
+
+    # Difficulty stops growing at MAX_LEVELS - past it obstacles outgrow the
+    # screen. Later levels still differ through their own rng
+    level = min(level, MAX_LEVELS)
+
+    # Scale difficulty with level - adjust platforms after level 7
+    if level <= 5:
+        base_platforms = 3 + (level // 2) + (level // 5)
+    elif level <= 7:
+        base_platforms = 8 + (level // 2) + (level // 4)
+    else:
+        base_platforms = 5 + (level // 4)  # Fewer platforms after level 7
+    base_coins = 5 + level * 3
+    base_obstacles = 2 + level + (level // 3)
+    base_health_pickups = 2 + (level // 4)
+
+    # Smooth background color transition
+    def lerp(a, b, t):
+        return int(a + (b - a) * t)
+    start_color = (135, 206, 235)  # Light blue
+    end_color = (10, 10, 20)       # Intense dark
+    t = min(1.0, (level - 1) / (MAX_LEVELS - 1))  # 0.0 at level 1, 1.0 at max level
+    background_color = (
+        lerp(start_color[0], end_color[0], t),
+        lerp(start_color[1], end_color[1], t),
+        lerp(start_color[2], end_color[2], t)
+    )
+
+    # Generate platforms with better distribution to fill right side
+    platforms = []
+    for i in range(base_platforms):
+        if level > 7:
+            gap_factor = 6.0  # Even larger space between platforms after level 7
+            platform_x = 50 + int(i * (width - 100) // (base_platforms * gap_factor))
+            platform_width = max(40, 120 - level * 7)  # Slightly narrower for more space
+        else:
+            platform_x = 50 + i * (width - 100) // base_platforms
+            platform_width = max(40, 120 - level * 6)
+        platform_height = 20
+
+        # Better platform distribution to fill the entire screen width
+        if level <= 10:
+            # For levels 1-10, use original spacing
+            platform_x = 50 + i * (width - 100) // base_platforms
+            platform_y = height - 200 - (i * 35) - (level * 10)
+        else:
+            # For levels 11+, ensure platforms cover the full width and don't go off-screen
+            platform_x = 50 + i * (width - 150) // (base_platforms - 1)  # Better distribution
+            platform_y = height - 200 - (i * 30) - (level * 8)  # Reduced height increase
+
+            # Ensure the last platform is within screen bounds
+            if i == base_platforms - 1:  # Last platform
+                platform_x = min(platform_x, width - 200)  # Keep within screen
+                platform_y = max(platform_y, 100)  # Don't go too high
+
+        platforms.append([platform_x, platform_y, platform_width, platform_height])
+
+    # Add extra platforms for levels 11+ to fill right side space
+    if level > 10:
+        extra_platforms = level // 3  # Add more platforms for higher levels
+        for i in range(extra_platforms):
+            # Add platforms in the right side area
+            extra_x = width - 300 + (i * 80)  # Start from right side
+            extra_y = height - 250 - (i * 40) - (level * 5)
+            extra_width = max(30, 80 - level * 3)
+            extra_height = 15
+
+            # Ensure extra platforms are within screen bounds
+            extra_x = max(50, min(extra_x, width - 150))
+            extra_y = max(100, min(extra_y, height - 150))
+
+            platforms.append([extra_x, extra_y, extra_width, extra_height])
+
+    # Generate coins
+    coins = []
+    for i in range(base_coins):
+        if i < len(platforms):
+            # Place coins on platforms
+            platform = platforms[i % len(platforms)]
+            coin_x = platform[0] + (platform[2] // 2) - 10
+            coin_y = platform[1] - 30
+        else:
+            # Place coins in air
+            coin_x = 100 + (i * 50) % (width - 200)
+            coin_y = height - 300 - (i * 30) % 200
+        coins.append([coin_x, coin_y])
+
+    # Generate obstacles with better distribution
+    obstacles = []
+    ground_obstacles = base_obstacles // 2
+    platform_obstacles = base_obstacles - ground_obstacles
+
+    # Ground obstacles - spread across full width
+    for i in range(ground_obstacles):
+        obstacle_width = 30 + level * 3
+        obstacle_height = 40 + level * 4
+        obstacle_x = 100 + (i * (width - 300) // max(1, ground_obstacles - 1))  # Better distribution
+        obstacle_y = height - obstacle_height - 10
+        obstacles.append([obstacle_x, obstacle_y, obstacle_width, obstacle_height])
+
+    # Platform obstacles
+    for i in range(platform_obstacles):
+        if i < len(platforms):
+            platform = platforms[i]
+            obstacle_width = 25 + level * 2
+            obstacle_height = 30 + level * 3
+            obstacle_x = platform[0] + (platform[2] // 2) - (obstacle_width // 2)
+            obstacle_y = platform[1] - obstacle_height - 5
+            obstacles.append([obstacle_x, obstacle_y, obstacle_width, obstacle_height])
+
+    # Add extra obstacles for levels 11+ to fill right side space
+    if level > 10:
+        extra_obstacles = level // 2  # Add more obstacles for higher levels
+        for i in range(extra_obstacles):
+            # Add obstacles in the right side area
+            extra_width = 25 + level * 2
+            extra_height = 30 + level * 3
+            extra_x = width - 400 + (i * 60)  # Spread across right side
+            extra_y = height - extra_height - 10
+
+            # Ensure extra obstacles are within screen bounds
+            extra_x = max(50, min(extra_x, width - 100))
+
+            obstacles.append([extra_x, extra_y, extra_width, extra_height])
+
+    # Generate enemies with better distribution
+    enemies = []
+
+    # Enemies increase with level - making game tougher
+    num_enemies = 2 + (level // 3)  # More enemies as level increases
+    for i in range(num_enemies):
+        enemy_width = 30
+        enemy_height = 40
+        enemy_x = rng.randint(50, width - 100)
+        enemy_y = rng.randint(120, height - 220)
+        enemy_speed = 1 + (level // 3)
+        # Assign movement type based on level
+        if level <= 3:
+            move_type = "static"
+        elif level <= 7:
+            move_type = rng.choice(["horizontal", "vertical"])
+        elif level <= 15:
+            move_type = rng.choice(["horizontal", "vertical", "dynamic"])
+        else:
+            move_type = "dynamic"
+        enemies.append([enemy_x, enemy_y, enemy_width, enemy_height, enemy_speed, 1, move_type])
+
+    # Generate health pickups (fewer in higher levels)
+    health_pickups = []
+    for i in range(base_health_pickups):
+        if i < len(platforms):
+            platform = platforms[i]
+            pickup_x = platform[0] + (platform[2] // 2) - 7
+            pickup_y = platform[1] - 25
+            health_pickups.append([pickup_x, pickup_y])
+
+    # Generate golden bucket - ensure it's always on screen and on the last platform
+    if platforms:  # If there are platforms
+        last_platform = platforms[-1]  # Get the last platform
+        bucket_x = last_platform[0] + (last_platform[2] // 2) - 15  # Center on platform
+        bucket_y = last_platform[1] - 25  # Slightly above platform
+
+        # Ensure bucket is within screen bounds
+        bucket_x = max(50, min(bucket_x, width - 100))  # Keep within screen width
+        bucket_y = max(50, min(bucket_y, height - 100))  # Keep within screen height
+    else:  # Fallback if no platforms
+        bucket_x = width - 150
+        bucket_y = height - 100
+    bucket = [bucket_x, bucket_y]
+
+    # Generate guardian enemy near the bucket
+    guardian_width = 40
+    guardian_height = 50
+    guardian_x = bucket_x - 100  # Start to the left of bucket
+    guardian_y = bucket_y - 60   # Slightly above bucket
+
+    # Ensure guardian is within screen bounds
+    guardian_x = max(50, min(guardian_x, width - 100))
+    guardian_y = max(50, min(guardian_y, height - 100))
+
+    guardian_speed = 2 + (level // 3)  # Slower speed
+    guardian_enemy = [guardian_x, guardian_y, guardian_width, guardian_height, guardian_speed, 1]  # Full screen patrol
+
+    return {
+        'platforms': platforms,
+        'coins': coins,
+        'obstacles': obstacles,
+        'enemies': enemies,
+        'health_pickups': health_pickups,
+        'background_color': background_color,
+        'bucket': bucket,
+        'guardian_enemy': guardian_enemy
+    }
+
+
+def shifted(items, dx):
+    """Copies of [x, y, ...] entities moved dx to the right"""
+    return [[item[0] + dx] + item[1:] for item in items]
+
+
+def get_wide_level_properties(level, width, height, screens, seed=DEFAULT_SEED):
+    """Lay out a level `screens` screens wide, one screen at a time.
+
+    The result has the same keys as get_level_properties() plus
+    ``world_width``; the bucket and guardian come from the last screen.
+    """
+    level_props = get_level_properties(level, width, height, level_rng(level, seed))
+    for screen in range(1, screens):
+        screen_props = get_level_properties(level, width, height, level_rng(level, seed, screen))
+        left = screen * width
+        for key in ('platforms', 'coins', 'obstacles', 'enemies', 'health_pickups'):
+            level_props[key].extend(shifted(screen_props[key], left))
+        level_props['bucket'] = shifted([screen_props['bucket']], left)[0]
+        level_props['guardian_enemy'] = shifted([screen_props['guardian_enemy']], left)[0]
+    level_props['world_width'] = screens * width
+    return level_props
+
+
+def _cache_path(level, width, height, seed, screens=1):
+    size = f"{width}x{height}" if screens == 1 else f"{width}x{height}x{screens}"
+    return os.path.join(LEVEL_CACHE_DIR,
+                        f"level-v{CACHE_VERSION}-{level}-{size}-{seed}.json")
+
+
+def _read_disk_cache(path):
+    try:
+        with open(path, 'r') as f:
+            level_props = json.load(f)
+    except (OSError, ValueError):
+        return None
+    level_props['background_color'] = tuple(level_props['background_color'])
+    return level_props
+
+
+def _write_disk_cache(path, level_props):
+    try:
+        os.makedirs(LEVEL_CACHE_DIR, exist_ok=True)
+        write_json(path, level_props)
+    except OSError:
+        pass  # The cache is only an optimisation
+
+
+@functools.lru_cache(maxsize=LEVEL_CACHE_SIZE)
+def _cached_level(level, width, height, seed, screens, disk_cache):
+    path = _cache_path(level, width, height, seed, screens) if disk_cache and LEVEL_CACHE_DIR else None
+    level_props = _read_disk_cache(path) if path else None
+    if level_props is None:
+        if screens == 1:
+            level_props = get_level_properties(level, width, height, level_rng(level, seed))
+        else:
+            level_props = get_wide_level_properties(level, width, height, screens, seed)
+        if path:
+            _write_disk_cache(path, level_props)
+    return level_props
+
+
+def load_level(level, width, height, seed=DEFAULT_SEED, screens=1, disk_cache=True):
+    """Return the properties of a level as a fresh copy the caller may modify.
+
+    With disk_cache False the level is only kept in memory, for callers that
+    go through many seeds and would never load the same one again.
+    """
+    return copy.deepcopy(_cached_level(level, width, height, seed, screens, disk_cache))
+
+
+def clear_level_cache():
+    """Forget the in-memory cache (the disk cache is left alone)"""
+    _cached_level.cache_clear()
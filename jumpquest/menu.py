@@ -0,0 +1,612 @@
+"""Main menu, level selection, character selection and instructions, drawn
+with pygame in the game's own window.
+
+Each scene renders its static parts (titles, buttons, cards, text) once
+into cached Surfaces and redraws only by blitting them, and the menu sleeps
+in pygame.event.wait() between inputs. Going from the menu to a level and
+back never leaves the fullscreen display.
+"""
+
+import pygame
+
+from .colors import (
+    GOLD,
+    MENU_BACKGROUND,
+    MENU_BLUE,
+    MENU_BLUE_ACTIVE,
+    MENU_GREEN,
+    MENU_GREEN_ACTIVE,
+    MENU_MUTED,
+    MENU_ORANGE,
+    MENU_ORANGE_ACTIVE,
+    MENU_PANEL,
+    MENU_PURPLE,
+    MENU_PURPLE_ACTIVE,
+    MENU_RED,
+    MENU_RED_ACTIVE,
+    MENU_SELECTED,
+    MENU_TEXT,
+    WHITE,
+)
+from .endless import ENDLESS_LEVEL
+from .levels import MAX_LEVELS
+from .sprites import render_character
+from .text import get_font, render_text
+
+# What Menu.run() returns
+PLAY = "play"
+QUIT = "quit"
+
+CHARACTER_INFO = {
+    "mario": ("Mario", MENU_RED,
+              ("Classic Nintendo hero", "Red overalls, blue shirt", "Mustache and red cap", "Balanced character")),
+    "doraemon": ("Doraemon", MENU_BLUE,
+                 ("Blue robotic cat", "White face, red nose", "Red collar and bell", "Friendly and helpful")),
+    "heman": ("He-Man", (255, 107, 53),
+              ("Masters of the Universe hero", "Brown hair, muscular build", "Blue armor and red cape",
+               "Powerful warrior")),
+}
+
+INSTRUCTIONS = (
+    ("Game Controls:", MENU_ORANGE),
+    "LEFT ARROW: Move left",
+    "RIGHT ARROW: Move right",
+    "SPACE: Jump (enhanced for long distances)",
+    "P: Activate power-up (when available)",
+    "ESC: Exit fullscreen",
+    "F3: Frame profiler",
+    "",
+    ("Game Features:", MENU_ORANGE),
+    "50 Levels with EXTREME difficulty progression",
+    "Level selection with unlock system",
+    "Endless mode - run as far as you can through a world that never ends",
+    "Multiple characters to choose from",
+    "Enhanced jumping - reach distant platforms",
+    "Platforms to jump on and collect coins",
+    "Health system - avoid enemies",
+    "Health pickups (red hearts) restore 30 HP",
+    "Power-up system - collect 5 coins, press P to activate",
+    "Invincibility power lasts 15 seconds",
+    "Purple glow effect when power is active",
+    "Obstacles and enemies on ground AND platforms",
+    "Golden bucket goal - on the final step/platform",
+    "Guardian enemy protects the golden bucket",
+    "Guardian does more damage than regular enemies",
+    "Fewer health pickups in higher levels",
+    "After level 10: More platforms and obstacles fill right side",
+    "Upper and lower borders limit movement",
+    "",
+    ("Objective:", MENU_ORANGE),
+    "Use enhanced jumping to reach the final platform",
+    "Collect the golden bucket on the last step",
+    "Collect 5 coins then press P for invincibility power",
+    "Avoid or defeat the guardian enemy",
+    "Maintain your health using pickups",
+    "Get the highest score possible!",
+)
+
+BUTTON_WIDTH = 360
+BUTTON_HEIGHT = 64
+LINE_HEIGHT = 30
+
+
+def draw_panel(surface, color, rect, border=3):
+    """A raised box like the old Tk buttons"""
+    pygame.draw.rect(surface, color, rect)
+    pygame.draw.rect(surface, tuple(min(255, c + 40) for c in color), rect, border)
+
+
+def blit_centered(surface, text_surface, center):
+    surface.blit(text_surface, text_surface.get_rect(center=center))
+
+
+class Button:
+    """A pre-rendered button with a normal and a focused look"""
+
+    def __init__(self, label, action, color, active_color, center, size=(BUTTON_WIDTH, BUTTON_HEIGHT),
+                 font_size=40):
+        self.action = action
+        self.rect = pygame.Rect((0, 0), size)
+        self.rect.center = center
+        self.normal = self._render(label, color, font_size, MENU_TEXT)
+        self.focused = self._render(label, active_color, font_size, GOLD)
+
+    def _render(self, label, color, font_size, outline):
+        surface = pygame.Surface(self.rect.size)
+        draw_panel(surface, color, surface.get_rect())
+        pygame.draw.rect(surface, outline, surface.get_rect(), 3)
+        blit_centered(surface, render_text(label, font_size, WHITE), surface.get_rect().center)
+        return surface
+
+    def draw(self, surface, focused):
+        surface.blit(self.focused if focused else self.normal, self.rect)
+
+
+class Scene:
+    """One menu screen. handle() returns a scene name, (PLAY, level), QUIT or None"""
+
+    def __init__(self, menu):
+        self.menu = menu
+        self.background = None
+
+    def open(self):
+        """Called every time the scene is shown"""
+        if self.background is None:
+            self.background = pygame.Surface((self.menu.width, self.menu.height)).convert()
+            self.background.fill(MENU_BACKGROUND)
+            self.build(self.background)
+
+    def build(self, background):
+        """Render everything that doesn't change into the background"""
+
+    def handle(self, event):
+        return None
+
+    def draw(self, surface):
+        surface.blit(self.background, (0, 0))
+
+
+class ButtonScene(Scene):
+    """A scene whose controls are a vertical list of buttons"""
+
+    def __init__(self, menu):
+        super().__init__(menu)
+        self.buttons = []
+        self.focus = 0
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_UP, pygame.K_LEFT):
+                self.focus = (self.focus - 1) % len(self.buttons)
+            elif event.key in (pygame.K_DOWN, pygame.K_RIGHT, pygame.K_TAB):
+                self.focus = (self.focus + 1) % len(self.buttons)
+            elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE):
+                return self.buttons[self.focus].action
+            elif event.key == pygame.K_ESCAPE:
+                return self.cancel()
+        elif event.type == pygame.MOUSEMOTION:
+            for i, button in enumerate(self.buttons):
+                if button.rect.collidepoint(event.pos):
+                    self.focus = i
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for button in self.buttons:
+                if button.rect.collidepoint(event.pos):
+                    return button.action
+        return None
+
+    def cancel(self):
+        return "main"
+
+    def draw(self, surface):
+        super().draw(surface)
+        for i, button in enumerate(self.buttons):
+            button.draw(surface, i == self.focus)
+
+
+class MainMenu(ButtonScene):
+    def open(self):
+        if not self.buttons:
+            cx = self.menu.width // 2
+            top = self.menu.height // 2 - 90
+            self.buttons = [
+                Button("START GAME", "levels", MENU_GREEN, MENU_GREEN_ACTIVE, (cx, top)),
+                Button("ENDLESS MODE", (PLAY, ENDLESS_LEVEL), MENU_ORANGE, MENU_ORANGE_ACTIVE, (cx, top + 80)),
+                Button("Instructions", "instructions", MENU_BLUE, MENU_BLUE_ACTIVE, (cx, top + 160)),
+                Button("SELECT CHARACTER", "characters", MENU_PURPLE, MENU_PURPLE_ACTIVE, (cx, top + 240)),
+                Button("QUIT", QUIT, MENU_RED, MENU_RED_ACTIVE, (cx, top + 320)),
+            ]
+        super().open()
+
+    def build(self, background):
+        cx = self.menu.width // 2
+        blit_centered(background, render_text("Jump Quest", 96, MENU_RED), (cx, self.menu.height // 2 - 260))
+        blit_centered(background, render_text(f"Enhanced Edition - {self.menu.level_count} Levels", 40, MENU_TEXT),
+                      (cx, self.menu.height // 2 - 190))
+        blit_centered(background, render_text("© 2024 Jump Quest - Enhanced Edition", 24, MENU_MUTED),
+                      (cx, self.menu.height - 20))
+
+    def cancel(self):
+        return QUIT
+
+    def draw(self, surface):
+        super().draw(surface)
+        status = self.menu.message or f"Character: {CHARACTER_INFO[self.menu.character][0]}"
+        blit_centered(surface, render_text(status, 32, MENU_ORANGE),
+                      (self.menu.width // 2, self.menu.height // 2 + 285))
+
+
+class LevelSelect(Scene):
+    """Scrolling grid of levels, ten to a row; locked levels can't be picked.
+
+    The grid is virtual: only the rows on screen exist. They are drawn from
+    a fixed pool of cell Surfaces, one per on-screen slot, and a slot is only
+    redrawn when a different level scrolls into it, so opening and
+    scrolling cost the same for 50 levels or 50,000.
+    """
+
+    COLUMNS = 10
+    CELL_HEIGHT = 70
+    GAP = 10
+
+    def __init__(self, menu):
+        super().__init__(menu)
+        self.focus = 0
+        self.first_row = 0  # Scroll position, in rows
+        self.unlocked = None
+        self.cell_width = min(100, (menu.width - 60) // self.COLUMNS - self.GAP)
+        self.label_format, self.label_size = self.choose_label(menu.level_count)
+        grid_width = self.COLUMNS * (self.cell_width + self.GAP) - self.GAP
+        self.left = (menu.width - grid_width) // 2
+        self.top = 140
+        self.visible_rows = max(1, (menu.height - 180 - self.top + self.GAP) // (self.CELL_HEIGHT + self.GAP))
+        self.slots = [None] * (self.visible_rows * self.COLUMNS)  # [surface, (level, unlocked)]
+        self.back = Button("Back to Menu", "main", MENU_RED, MENU_RED_ACTIVE,
+                           (menu.width // 2, menu.height - 70), size=(280, 56), font_size=34)
+
+    def choose_label(self, level_count):
+        """The (format, font size) every cell's label uses: "Level N" if the
+        widest label of the grid fits, otherwise just "N".
+
+        Decided once for the whole grid - digit widths vary, so deciding per
+        cell would mix the two in one row.
+        """
+        font = get_font(28)
+        widest_digit = max("0123456789", key=lambda digit: font.size(digit)[0])
+        if font.size(f"Level {widest_digit * len(str(level_count))}")[0] <= self.cell_width - 8:
+            return "Level {}", 28
+        return "{}", 32
+
+    @property
+    def rows(self):
+        return -(-self.menu.level_count // self.COLUMNS)
+
+    def cell_rect(self, index):
+        """Screen rect of a level's cell (only meaningful while its row is visible)"""
+        row, col = divmod(index, self.COLUMNS)
+        return pygame.Rect(self.left + col * (self.cell_width + self.GAP),
+                           self.top + (row - self.first_row) * (self.CELL_HEIGHT + self.GAP),
+                           self.cell_width, self.CELL_HEIGHT)
+
+    def index_at(self, pos):
+        """Index of the level cell under a screen position, or None"""
+        col, x = divmod(pos[0] - self.left, self.cell_width + self.GAP)
+        row, y = divmod(pos[1] - self.top, self.CELL_HEIGHT + self.GAP)
+        if not (0 <= col < self.COLUMNS and 0 <= row < self.visible_rows):
+            return None
+        if x >= self.cell_width or y >= self.CELL_HEIGHT:
+            return None  # In the gap between cells
+        index = (self.first_row + row) * self.COLUMNS + col
+        return index if index < self.menu.level_count else None
+
+    def cell(self, index):
+        """The recycled Surface showing a level, redrawn only if its slot held something else"""
+        slot = index % len(self.slots)
+        level = index + 1
+        key = (level, level <= self.unlocked)
+        entry = self.slots[slot]
+        if entry is None:
+            entry = self.slots[slot] = [pygame.Surface((self.cell_width, self.CELL_HEIGHT)).convert(), None]
+        surface = entry[0]
+        if entry[1] != key:
+            entry[1] = key
+            rect = surface.get_rect()
+            # Straight from the font, so thousands of labels don't churn the text cache
+            label = get_font(self.label_size).render(self.label_format.format(level), True, WHITE)
+            if key[1]:
+                draw_panel(surface, MENU_GREEN, rect)
+                blit_centered(surface, label, rect.center)
+            else:
+                draw_panel(surface, MENU_MUTED, rect)
+                blit_centered(surface, label, (rect.centerx, rect.centery - 10))
+                blit_centered(surface, render_text("locked", 22, MENU_BACKGROUND), (rect.centerx, rect.centery + 14))
+        return surface
+
+    def open(self):
+        unlocked = self.menu.progress.highest_unlocked_level
+        if unlocked != self.unlocked:
+            # A level was unlocked since the cells were drawn
+            self.unlocked = unlocked
+            self.slots = [None] * len(self.slots)
+        super().open()
+        self.focus = min(self.menu.level_count, max(1, self.menu.level)) - 1
+        self.scroll_to_focus()
+        self.focus_changed()
+
+    def build(self, background):
+        blit_centered(background, render_text("Select Level", 64, MENU_TEXT), (self.menu.width // 2, 70))
+
+    def scroll_to(self, first_row):
+        self.first_row = max(0, min(self.rows - self.visible_rows, first_row))
+
+    def scroll_to_focus(self):
+        row = self.focus // self.COLUMNS
+        if row < self.first_row:
+            self.scroll_to(row)
+        elif row >= self.first_row + self.visible_rows:
+            self.scroll_to(row - self.visible_rows + 1)
+
+    def focus_changed(self):
+        level = self.focus + 1
+        if level <= self.unlocked and self.menu.on_level_focus:
+            self.menu.on_level_focus(level)
+
+    def set_focus(self, index):
+        index = max(0, min(self.menu.level_count - 1, index))
+        if index != self.focus:
+            self.focus = index
+            self.scroll_to_focus()
+            self.focus_changed()
+
+    def choose(self, index):
+        level = index + 1
+        if level <= self.unlocked:
+            return PLAY, level
+        return None
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            page = self.visible_rows * self.COLUMNS
+            if event.key == pygame.K_LEFT:
+                self.set_focus(self.focus - 1)
+            elif event.key == pygame.K_RIGHT:
+                self.set_focus(self.focus + 1)
+            elif event.key == pygame.K_UP:
+                if self.focus >= self.COLUMNS:
+                    self.set_focus(self.focus - self.COLUMNS)
+            elif event.key == pygame.K_DOWN:
+                if self.focus + self.COLUMNS < self.menu.level_count:
+                    self.set_focus(self.focus + self.COLUMNS)
+            elif event.key == pygame.K_PAGEUP:
+                self.set_focus(self.focus - page)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.set_focus(self.focus + page)
+            elif event.key == pygame.K_HOME:
+                self.set_focus(0)
+            elif event.key == pygame.K_END:
+                # Last unlocked level, where the player most likely wants to go
+                self.set_focus(self.unlocked - 1)
+            elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE):
+                return self.choose(self.focus)
+            elif event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE):
+                return "main"
+        elif event.type == pygame.MOUSEWHEEL:
+            self.scroll_to(self.first_row - event.y)
+        elif event.type == pygame.MOUSEMOTION:
+            index = self.index_at(event.pos)
+            if index is not None and index != self.focus:
+                self.focus = index
+                self.focus_changed()
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.back.rect.collidepoint(event.pos):
+                return "main"
+            index = self.index_at(event.pos)
+            if index is not None:
+                return self.choose(index)
+        return None
+
+    def draw(self, surface):
+        super().draw(surface)
+
+        # Only the visible rows are drawn
+        first = self.first_row * self.COLUMNS
+        last = min(self.menu.level_count, first + self.visible_rows * self.COLUMNS)
+        for index in range(first, last):
+            surface.blit(self.cell(index), self.cell_rect(index))
+        if first <= self.focus < last:
+            pygame.draw.rect(surface, GOLD, self.cell_rect(self.focus).inflate(8, 8), 4)
+
+        # Scrollbar, when there is more than a screenful
+        if self.rows > self.visible_rows:
+            track = pygame.Rect(self.left + self.COLUMNS * (self.cell_width + self.GAP), self.top,
+                                8, self.visible_rows * (self.CELL_HEIGHT + self.GAP) - self.GAP)
+            thumb_height = max(20, track.height * self.visible_rows // self.rows)
+            thumb_top = track.top + (track.height - thumb_height) * self.first_row // (self.rows - self.visible_rows)
+            pygame.draw.rect(surface, MENU_PANEL, track)
+            pygame.draw.rect(surface, MENU_TEXT, (track.left, thumb_top, track.width, thumb_height))
+
+        self.back.draw(surface, False)
+
+        # Records of the focused level
+        level = self.focus + 1
+        if level <= self.unlocked:
+            stats = self.menu.progress.level_stats(level)
+            best_score = "-" if stats["best_score"] is None else stats["best_score"]
+            best_time = "-" if stats["best_time"] is None else f"{stats['best_time']:.1f} s"
+            info = f"Level {level}   Best score: {best_score}   Best time: {best_time}   Deaths: {stats['deaths']}"
+        else:
+            info = f"Level {level} is locked"
+        blit_centered(surface, render_text(info, 32, MENU_ORANGE), (self.menu.width // 2, self.menu.height - 140))
+
+
+class CharacterSelect(Scene):
+    """One card per character with a preview of its sprite"""
+
+    CARD_HEIGHT = 420
+    GAP = 40
+
+    def __init__(self, menu):
+        super().__init__(menu)
+        self.characters = list(CHARACTER_INFO)
+        self.focus = 0
+        self.cards = {}
+        count = len(self.characters)
+        self.card_width = min(320, (menu.width - 80 - (count - 1) * self.GAP) // count)
+        total = count * (self.card_width + self.GAP) - self.GAP
+        left = (menu.width - total) // 2
+        top = (menu.height - self.CARD_HEIGHT) // 2
+        self.rects = [pygame.Rect(left + i * (self.card_width + self.GAP), top, self.card_width, self.CARD_HEIGHT)
+                      for i in range(count)]
+
+    def card(self, character, selected):
+        """Card surface for a character, built on first use"""
+        key = (character, selected)
+        surface = self.cards.get(key)
+        if surface is None:
+            name, color, description = CHARACTER_INFO[character]
+            surface = pygame.Surface((self.card_width, self.CARD_HEIGHT)).convert()
+            draw_panel(surface, MENU_SELECTED if selected else MENU_PANEL, surface.get_rect())
+            blit_centered(surface, render_text(name, 48, color), (self.card_width // 2, 40))
+            sprite = render_character(character, 40, 50)
+            sprite = pygame.transform.scale(sprite, (sprite.get_width() * 2, sprite.get_height() * 2))
+            blit_centered(surface, sprite, (self.card_width // 2, 150))
+            for i, line in enumerate(description):
+                blit_centered(surface, render_text(line, 26, MENU_TEXT), (self.card_width // 2, 250 + i * 28))
+            blit_centered(surface, render_text("SELECTED" if selected else "SELECT", 32, WHITE),
+                          (self.card_width // 2, self.CARD_HEIGHT - 30))
+            self.cards[key] = surface
+        return surface
+
+    def build(self, background):
+        blit_centered(background, render_text("Choose Your Character", 64, MENU_RED),
+                      (self.menu.width // 2, self.rects[0].top - 60))
+
+    def open(self):
+        super().open()
+        self.focus = self.characters.index(self.menu.character)
+
+    def select(self, index):
+        character = self.characters[index]
+        self.menu.character = character
+        self.menu.message = f"You have selected {CHARACTER_INFO[character][0]}!"
+        return "main"
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_LEFT, pygame.K_UP):
+                self.focus = (self.focus - 1) % len(self.characters)
+            elif event.key in (pygame.K_RIGHT, pygame.K_DOWN, pygame.K_TAB):
+                self.focus = (self.focus + 1) % len(self.characters)
+            elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE):
+                return self.select(self.focus)
+            elif event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE):
+                return "main"
+        elif event.type == pygame.MOUSEMOTION:
+            for i, rect in enumerate(self.rects):
+                if rect.collidepoint(event.pos):
+                    self.focus = i
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for i, rect in enumerate(self.rects):
+                if rect.collidepoint(event.pos):
+                    return self.select(i)
+        return None
+
+    def draw(self, surface):
+        super().draw(surface)
+        for i, (character, rect) in enumerate(zip(self.characters, self.rects)):
+            surface.blit(self.card(character, character == self.menu.character), rect)
+            if i == self.focus:
+                pygame.draw.rect(surface, GOLD, rect.inflate(10, 10), 4)
+        blit_centered(surface, render_text(f"Current Character: {CHARACTER_INFO[self.menu.character][0]}",
+                                           36, MENU_ORANGE),
+                      (self.menu.width // 2, self.rects[0].bottom + 50))
+
+
+class Instructions(Scene):
+    """The controls and rules, scrollable when the screen is short"""
+
+    def __init__(self, menu):
+        super().__init__(menu)
+        self.text = None
+        self.scroll = 0
+        self.view = pygame.Rect(0, 120, menu.width, menu.height - 200)
+
+    def build(self, background):
+        blit_centered(background, render_text("Instructions", 64, MENU_TEXT), (self.menu.width // 2, 60))
+        blit_centered(background, render_text("ESC to go back", 28, MENU_MUTED),
+                      (self.menu.width // 2, self.menu.height - 40))
+        lines = [line if isinstance(line, tuple) else (line and "• " + line, MENU_TEXT)
+                 for line in INSTRUCTIONS]
+        self.text = pygame.Surface((self.menu.width, len(lines) * LINE_HEIGHT)).convert()
+        self.text.fill(MENU_BACKGROUND)
+        left = max(20, self.menu.width // 2 - 380)
+        for i, (line, color) in enumerate(lines):
+            if line:
+                self.text.blit(render_text(line, 32, color), (left, i * LINE_HEIGHT))
+
+    def open(self):
+        super().open()
+        self.scroll = 0
+
+    def scroll_by(self, delta):
+        limit = max(0, self.text.get_height() - self.view.height)
+        self.scroll = max(0, min(limit, self.scroll + delta))
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.scroll_by(-LINE_HEIGHT)
+            elif event.key == pygame.K_DOWN:
+                self.scroll_by(LINE_HEIGHT)
+            elif event.key == pygame.K_PAGEUP:
+                self.scroll_by(-self.view.height)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.scroll_by(self.view.height)
+            elif event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE, pygame.K_RETURN, pygame.K_KP_ENTER):
+                return "main"
+        elif event.type == pygame.MOUSEWHEEL:
+            self.scroll_by(-event.y * LINE_HEIGHT * 3)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            return "main"
+        return None
+
+    def draw(self, surface):
+        super().draw(surface)
+        surface.blit(self.text, self.view, pygame.Rect(0, self.scroll, self.view.width, self.view.height))
+
+
+class Menu:
+    """All menu scenes for one display; keeps their cached surfaces between visits"""
+
+    def __init__(self, window, progress, character="mario", level_count=MAX_LEVELS):
+        self.window = window
+        self.width, self.height = window.get_size()
+        self.progress = progress
+        self.character = character
+        self.level = 1
+        self.level_count = level_count
+        self.message = None
+        self.on_level_focus = None
+        self.scenes = {
+            "main": MainMenu(self),
+            "levels": LevelSelect(self),
+            "characters": CharacterSelect(self),
+            "instructions": Instructions(self),
+        }
+
+    def run(self, scene="main", level=1, on_level_focus=None, on_shown=None):
+        """Show the menu until the player picks a level or quits.
+
+        Returns (PLAY, level) or (QUIT, None). ``on_level_focus`` is called
+        with every unlocked level the cursor lands on, so the caller can
+        start building it before it's chosen. ``on_shown`` is called once
+        the first frame is on screen.
+        """
+        self.level = level
+        self.on_level_focus = on_level_focus
+        current = self.scenes[scene]
+        current.open()
+        while True:
+            current.draw(self.window)
+            pygame.display.flip()
+            if on_shown:
+                on_shown()
+                on_shown = None
+
+            # Sleep until something happens, then handle everything queued
+            events = [pygame.event.wait()] + pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    return QUIT, None
+                result = current.handle(event)
+                if result is None:
+                    continue
+                if result == QUIT:
+                    return QUIT, None
+                if isinstance(result, tuple):
+                    self.message = None
+                    return result
+                if result != "main":
+                    self.message = None
+                # Keys already queued go to the new scene
+                current = self.scenes[result]
+                current.open()
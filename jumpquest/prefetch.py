@@ -0,0 +1,75 @@
+"""Build the next level in the background while the current one is played.
+
+Generating a level, indexing it and baking its static layer happen on a
+worker thread, so when the player answers "Continue to next level?" the
+next level is already waiting and the switch is immediate. Only the most
+recently requested level is kept, so running the menu cursor over a long
+row of levels never holds more than one finished level in memory.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from .engine import MAX_HEALTH, GameState
+from .levels import DEFAULT_SEED
+from .render import build_static_layer
+
+
+def prepare_level(level, width, height, seed=DEFAULT_SEED, screens=1, texture=True):
+    """Build a level's state and (unconverted) static layer, with or without
+    the platform texture.
+
+    Levels wider than the screen get no static layer (None): they scroll,
+    and render.ScrollingBackground bakes them a strip at a time instead.
+    """
+    state = GameState(level, width, height, seed=seed, screens=screens)
+    if screens > 1:
+        return state, None
+    return state, build_static_layer(state, convert=False, texture=texture)
+
+
+class LevelPrefetcher:
+    """One worker thread that prepares levels ahead of time"""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-prefetch")
+        self._pending = {}
+
+    def prefetch(self, level, width, height, seed=DEFAULT_SEED, screens=1, texture=True):
+        """Start preparing a level in the background, dropping any level asked for earlier"""
+        key = (level, width, height, seed, screens, texture)
+        if key not in self._pending:
+            self._drop_pending()
+            self._pending[key] = self._executor.submit(prepare_level, level, width, height, seed, screens,
+                                                       texture)
+
+    def _drop_pending(self):
+        # Not started yet: never start. Running or done: the result is discarded
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def take(self, level, width, height, health=MAX_HEALTH, seed=DEFAULT_SEED, screens=1, texture=True):
+        """Return (state, static_layer) for a level, prefetched if possible.
+
+        Waits for the worker if the level is still being built and builds it
+        right here if it was never prefetched. Anything else still pending is
+        dropped.
+        """
+        future = self._pending.pop((level, width, height, seed, screens, texture), None)
+        self._drop_pending()
+
+        if future is not None:
+            state, static_layer = future.result()
+        else:
+            state, static_layer = prepare_level(level, width, height, seed, screens, texture)
+        state.health = health
+        if static_layer is not None and pygame.display.get_surface() is not None:
+            static_layer = static_layer.convert()
+        return state, static_layer
+
+    def shutdown(self):
+        """Stop the worker, abandoning anything not started yet"""
+        self._drop_pending()
+        self._executor.shutdown(wait=False)
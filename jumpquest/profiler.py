@@ -0,0 +1,154 @@
+"""Per-phase frame profiler with an on-screen chart and CSV export.
+
+The game loop calls ``lap(phase)`` after each part of a frame; the time since
+the previous lap is charged to that phase. Finished frames go into a rolling
+history drawn as stacked bars against the 16.6 ms budget, and can also be
+streamed to a CSV file, one row per frame.
+"""
+
+import csv
+import time
+from collections import deque
+
+import pygame
+
+from .text import render_text
+from .timing import FRAME_BUDGET
+
+# Every phase the game loop reports, in frame order
+PHASES = (
+    "event pump",
+    "input",
+    "world streaming",
+    "jump/gravity",
+    "platform collision",
+    "enemy update",
+    "obstacle collision",
+    "enemy collision",
+    "pickup/coin collision",
+    "power/bucket",
+    "draw static",
+    "draw enemies",
+    "draw guardian",
+    "draw bucket",
+    "draw hearts",
+    "draw coins",
+    "draw player",
+    "draw_ui",
+    "profiler overlay",
+    "display.update",
+)
+
+PHASE_COLORS = (
+    (230, 25, 75), (60, 180, 75), (255, 225, 25), (0, 130, 200), (245, 130, 48),
+    (145, 30, 180), (70, 240, 240), (240, 50, 230), (210, 245, 60), (250, 190, 212),
+    (0, 128, 128), (220, 190, 255), (170, 110, 40), (255, 250, 200), (128, 0, 0),
+    (170, 255, 195), (128, 128, 0), (255, 215, 180), (0, 0, 128), (128, 128, 128),
+)
+
+HISTORY = 120  # Frames shown in the chart
+BAR_WIDTH = 2
+CHART_HEIGHT = 120  # Pixels for two frame budgets
+OVERLAY_TOGGLE_KEY = pygame.K_F3
+
+
+class FrameProfiler:
+    """Collect per-phase timings for each frame"""
+
+    def __init__(self, csv_path=None, history=HISTORY):
+        self.overlay = False
+        self.frames = deque(maxlen=history)
+        self.current = {}
+        self._last = 0.0
+        self._background = None
+        self._csv_file = None
+        self._csv_writer = None
+        if csv_path:
+            self._csv_file = open(csv_path, 'w', newline='')
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(["frame"] + [f"{phase} (ms)" for phase in PHASES])
+        self.frame_count = 0
+
+    @property
+    def active(self):
+        """Timing is only collected while the overlay is up or CSV export is on"""
+        return self.overlay or self._csv_writer is not None
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.frames.clear()
+
+    def start_frame(self):
+        self.current = {}
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the last lap to a phase"""
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def end_frame(self):
+        self.frame_count += 1
+        self.frames.append(self.current)
+        if self._csv_writer is not None:
+            self._csv_writer.writerow([self.frame_count] +
+                                      [f"{self.current.get(phase, 0.0) * 1000:.4f}" for phase in PHASES])
+
+    def averages(self):
+        """Average milliseconds per phase over the history"""
+        if not self.frames:
+            return {}
+        count = len(self.frames)
+        return {phase: sum(frame.get(phase, 0.0) for frame in self.frames) * 1000 / count
+                for phase in PHASES}
+
+    def draw(self, surface):
+        """Draw the stacked bar chart and legend in the top-right corner; returns its area"""
+        scale = CHART_HEIGHT / (2 * FRAME_BUDGET)
+        chart_width = HISTORY * BAR_WIDTH
+        legend_width = 230
+        width = chart_width + legend_width + 30
+        height = max(CHART_HEIGHT, len(PHASES) * 16) + 40
+        left = surface.get_width() - width - 10
+        top = 30
+
+        panel = pygame.Rect(left, top, width, height)
+        if self._background is None:
+            self._background = pygame.Surface(panel.size)
+            self._background.set_alpha(190)
+            self._background.fill((0, 0, 0))
+        surface.blit(self._background, panel.topleft)
+
+        # One stacked bar per frame, oldest on the left
+        base = top + 10 + CHART_HEIGHT
+        for i, frame in enumerate(self.frames):
+            x = left + 10 + i * BAR_WIDTH
+            y = base
+            for phase, color in zip(PHASES, PHASE_COLORS):
+                bar = int(frame.get(phase, 0.0) * scale)
+                if bar:
+                    y -= bar
+                    pygame.draw.rect(surface, color, (x, max(y, top + 10), BAR_WIDTH, min(bar, y + bar - top - 10)))
+
+        # 16.6 ms budget line
+        budget_y = base - int(FRAME_BUDGET * scale)
+        pygame.draw.line(surface, (255, 255, 255), (left + 10, budget_y), (left + 10 + chart_width, budget_y))
+
+        # Legend with the rolling average of each phase
+        averages = self.averages()
+        total = sum(averages.values())
+        text_x = left + chart_width + 20
+        surface.blit(render_text(f"frame {total:.2f} ms", 20, (255, 255, 255)), (text_x, top + 6))
+        for row, (phase, color) in enumerate(zip(PHASES, PHASE_COLORS)):
+            y = top + 24 + row * 16
+            pygame.draw.rect(surface, color, (text_x, y + 3, 10, 10))
+            surface.blit(render_text(f"{phase} {averages.get(phase, 0.0):.2f}", 18, (230, 230, 230)),
+                         (text_x + 14, y))
+        return panel
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
@@ -0,0 +1,169 @@
+"""Player progress kept in memory and saved in the background.
+
+The save file is read once. After that every query is answered from memory
+and every change only marks the data dirty; a writer thread waits a moment
+so a burst of changes becomes one write, then saves through a temp file and
+os.replace() so a crash mid-write never leaves a broken file behind.
+
+Besides the highest unlocked level the file keeps, per level, the best
+score, the best completion time and the number of deaths. Old files that
+only hold ``highest_unlocked_level`` are upgraded on load.
+"""
+
+import atexit
+import copy
+import json
+import threading
+import time
+
+from .storage import write_json
+
+PROGRESS_FILE = "game_progress.json"
+SCHEMA_VERSION = 2
+SAVE_DELAY = 0.5  # Seconds to wait for more changes before writing
+
+
+def new_level_stats():
+    return {"best_score": None, "best_time": None, "deaths": 0, "completions": 0}
+
+
+def migrate(data):
+    """Bring a loaded save file up to SCHEMA_VERSION"""
+    version = data.get("version", 1)
+    if version < 2:
+        # Version 1 only stored the highest unlocked level
+        data = {"highest_unlocked_level": data.get("highest_unlocked_level", 1), "levels": {}}
+    data["version"] = SCHEMA_VERSION
+    data.setdefault("highest_unlocked_level", 1)
+    data.setdefault("levels", {})
+    return data
+
+
+class ProgressStore:
+    """In-memory progress with coalesced, atomic background saves"""
+
+    def __init__(self, path=PROGRESS_FILE, save_delay=SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self.data = self._read()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._dirty = False
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="progress-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as e:
+            print(f"Could not read {self.path} ({e}), starting from level 1")
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        return migrate(data)
+
+    # Queries
+
+    @property
+    def highest_unlocked_level(self):
+        return self.data["highest_unlocked_level"]
+
+    def level_stats(self, level):
+        """Best score, best time, deaths and completions of a level"""
+        with self._lock:
+            return dict(new_level_stats(), **(self.data["levels"].get(str(level)) or {}))
+
+    # Changes
+
+    def _level(self, level):
+        # Hand-edited entries may lack some keys; fill them in rather than crash mid-game
+        stats = self.data["levels"][str(level)] = self.data["levels"].get(str(level)) or {}
+        for key, value in new_level_stats().items():
+            stats.setdefault(key, value)
+        return stats
+
+    def unlock(self, level):
+        """Make sure every level up to `level` is playable"""
+        with self._lock:
+            if level > self.data["highest_unlocked_level"]:
+                self.data["highest_unlocked_level"] = level
+                self._mark_dirty()
+
+    def record_death(self, level):
+        with self._lock:
+            self._level(level)["deaths"] += 1
+            self._mark_dirty()
+
+    def record_completion(self, level, score, seconds):
+        """Count a completed run and keep it if it is the best score or time"""
+        with self._lock:
+            stats = self._level(level)
+            stats["completions"] += 1
+            if stats["best_score"] is None or score > stats["best_score"]:
+                stats["best_score"] = score
+            if stats["best_time"] is None or seconds < stats["best_time"]:
+                stats["best_time"] = round(seconds, 2)
+            self._mark_dirty()
+
+    # Saving
+
+    def _mark_dirty(self):
+        self._dirty = True
+        self._changed.notify()
+
+    def _write_loop(self):
+        with self._lock:
+            while True:
+                while not self._dirty and not self._closed:
+                    self._changed.wait()
+                if not self._dirty:
+                    return
+                # Let further changes pile up, then save them all at once
+                deadline = time.monotonic() + self.save_delay
+                while not self._closed and not self._flush_requested:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                snapshot = copy.deepcopy(self.data)
+                self._dirty = False
+                self._flush_requested = False
+                self._writing = True
+                self._lock.release()
+                try:
+                    self._write(snapshot)
+                finally:
+                    self._lock.acquire()
+                    self._writing = False
+                    self._changed.notify_all()
+
+    def _write(self, data):
+        try:
+            write_json(self.path, data, indent=2)
+        except OSError as e:
+            print(f"Could not save progress to {self.path}: {e}")
+
+    def flush(self):
+        """Block until every change so far is on disk"""
+        with self._lock:
+            if self._closed:
+                return
+            if self._dirty:
+                self._flush_requested = True
+                self._changed.notify_all()
+            while (self._dirty or self._writing) and self._writer.is_alive():
+                self._changed.wait()
+
+    def close(self):
+        """Save whatever is pending and stop the writer"""
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+        self._writer.join()
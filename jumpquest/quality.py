@@ -0,0 +1,83 @@
+"""Adaptive quality for the purely decorative effects.
+
+Coin and bucket sparkles, the pulsing ring round hearts, the purple power
+glow and the texture strip on platforms don't change the game, they only
+cost drawing time. ``QualityGovernor`` watches how long recent frames took
+to produce and, when they run over the 60 FPS budget, steps down one tier
+at a time, dropping those effects in that order. Once there is plenty of
+headroom again for a while it steps back up.
+"""
+
+from collections import namedtuple
+
+from .timing import FRAME_BUDGET
+
+# Which decorations are drawn
+Quality = namedtuple("Quality", ["sparkles", "pulses", "glow", "texture"])
+
+# Lowest to highest; each tier drops one more effect than the one above it
+TIERS = (
+    Quality(sparkles=False, pulses=False, glow=False, texture=False),
+    Quality(sparkles=False, pulses=False, glow=False, texture=True),
+    Quality(sparkles=False, pulses=False, glow=True, texture=True),
+    Quality(sparkles=False, pulses=True, glow=True, texture=True),
+    Quality(sparkles=True, pulses=True, glow=True, texture=True),
+)
+TIER_NAMES = ("minimal", "low", "medium", "high", "full")
+FULL_QUALITY = TIERS[-1]
+
+SAMPLE_FRAMES = 30  # Frames averaged before each decision
+STEP_DOWN_LOAD = 0.9  # Step down when frames take this much of the budget...
+STEP_UP_LOAD = 0.5  # ...and up when they take less than this
+STEP_UP_SAMPLES = 4  # for this many samples in a row
+
+
+class QualityGovernor:
+    """Pick a quality tier from recent frame times"""
+
+    def __init__(self, tier=len(TIERS) - 1, adaptive=True, budget=FRAME_BUDGET):
+        self.tier = tier
+        self.adaptive = adaptive
+        self.budget = budget
+        self._total = 0.0
+        self._frames = 0
+        self._calm_samples = 0
+
+    @property
+    def quality(self):
+        return TIERS[self.tier]
+
+    @property
+    def name(self):
+        return TIER_NAMES[self.tier]
+
+    def record(self, work_time):
+        """Record the seconds spent producing one frame (sleeps excluded).
+
+        Returns True when the tier changed, so cached drawings that depend
+        on it can be rebuilt.
+        """
+        if not self.adaptive:
+            return False
+        self._total += work_time
+        self._frames += 1
+        if self._frames < SAMPLE_FRAMES:
+            return False
+        load = self._total / self._frames / self.budget
+        self._total = 0.0
+        self._frames = 0
+
+        if load > STEP_DOWN_LOAD:
+            self._calm_samples = 0
+            if self.tier > 0:
+                self.tier -= 1
+                return True
+        elif load < STEP_UP_LOAD:
+            self._calm_samples += 1
+            if self._calm_samples >= STEP_UP_SAMPLES and self.tier < len(TIERS) - 1:
+                self._calm_samples = 0
+                self.tier += 1
+                return True
+        else:
+            self._calm_samples = 0
+        return False
@@ -0,0 +1,509 @@
+"""Level rendering helpers shared by the game loop"""
+
+import pygame
+
+from .colors import (
+    BLACK,
+    BRIGHT_RED,
+    BROWN,
+    DARK_GOLD,
+    DARK_GREEN,
+    DEEP_RED,
+    GOLD,
+    ORANGE,
+    PURPLE,
+    RED,
+    WHITE,
+    YELLOW,
+)
+from .engine import BORDER, COINS_FOR_POWER, MAX_HEALTH
+from .levels import MAX_LEVELS
+from .quality import FULL_QUALITY
+from .text import render_text
+
+PLATFORM_TEXTURE = (160, 82, 45)
+CULL_MARGIN = 50  # Entities closer than this to the view are still drawn
+
+
+def build_static_layer(state, convert=True, texture=True):
+    """Bake everything that never moves in a level into one Surface.
+
+    That is the background, both borders, the platforms and the obstacles.
+    It is built once when the level loads and blitted in a single call each
+    frame; only the moving entities are drawn on top of it. Pass
+    convert=False when building off the main thread and convert() the
+    result on the main thread before use.
+    """
+    layer = pygame.Surface((state.width, state.height))
+    if convert and pygame.display.get_surface() is not None:
+        layer = layer.convert()
+    draw_static(layer, state.background_color, state.platforms, state.obstacles, texture=texture)
+    return layer
+
+
+def draw_static(surface, background_color, platforms, obstacles, offset_x=0, texture=True):
+    """Paint the background, borders, platforms (textured unless texture is False)
+    and obstacles, shifted left by offset_x"""
+    width, height = surface.get_size()
+    surface.fill(background_color)
+
+    # Upper border and ground
+    pygame.draw.rect(surface, DARK_GREEN, (0, 0, width, BORDER))
+    pygame.draw.rect(surface, DARK_GREEN, (0, height - BORDER, width, BORDER))
+
+    # Platforms
+    for platform in platforms:
+        pygame.draw.rect(surface, BROWN, (platform[0] - offset_x, platform[1], platform[2], platform[3]))
+        # Add some texture to platforms
+        if texture:
+            pygame.draw.rect(surface, PLATFORM_TEXTURE, (platform[0] - offset_x, platform[1], platform[2], 5))
+
+    # Obstacles (ground and platform obstacles)
+    for obstacle in obstacles:
+        pygame.draw.rect(surface, ORANGE, (obstacle[0] - offset_x, obstacle[1], obstacle[2], obstacle[3]))
+
+
+class DirtyRects:
+    """Restore and push only the parts of the screen that changed.
+
+    Every frame the areas drawn last frame are painted back from the static
+    layer, the moving entities are drawn and their bounding boxes added, and
+    only the union of old and new boxes is sent to display.update(). With
+    ``enabled`` False it falls back to a full blit and a full update.
+    Given the level's ``state``, set_texture() bakes the layer again.
+    """
+
+    def __init__(self, background, enabled=True, state=None, texture=True):
+        self.background = background
+        self.enabled = enabled
+        self.state = state
+        self.texture = texture
+        self.previous = []
+        self.current = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Force the next frame to repaint and push the whole screen"""
+        self.full_redraw = True
+
+    def scroll_to(self, camera_x):
+        pass  # The static layer is exactly the screen
+
+    def set_texture(self, texture):
+        """Show or hide the platform texture"""
+        if texture != self.texture and self.state is not None:
+            self.texture = texture
+            self.background = build_static_layer(self.state, texture=texture)
+            self.invalidate()
+
+    def restore(self, window):
+        """Start a frame by painting the background over last frame's entities"""
+        if self.full_redraw or not self.enabled:
+            window.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous:
+                window.blit(self.background, rect, rect)
+        self.current = []
+
+    def add(self, rect):
+        """Record an area drawn this frame"""
+        if self.enabled and rect:
+            self.current.append(pygame.Rect(rect))
+
+    def extend(self, rects):
+        for rect in rects:
+            self.add(rect)
+
+    def update_display(self):
+        """Push this frame to the screen"""
+        if self.full_redraw or not self.enabled:
+            pygame.display.update()
+            self.full_redraw = False
+        else:
+            pygame.display.update(self.previous + self.current)
+        self.previous = self.current
+
+
+class ScrollingBackground:
+    """Static layer for a world wider than the screen.
+
+    The world is cut into screen-wide strips. A strip is baked from the
+    platform and obstacle grids the first time it comes near the view and
+    dropped again once the view has moved on, so only a handful exist at
+    any time. Every frame the visible strips are blitted at the camera
+    offset and the whole screen is pushed. It has the same interface as
+    DirtyRects, so the game loop can use either.
+    """
+
+    def __init__(self, state, texture=True):
+        self.state = state
+        self.width = state.width
+        self.height = state.height
+        self.strips = {}
+        self.camera_x = 0
+        self.texture = texture  # Platform texture (dropped at low quality)
+
+    def scroll_to(self, camera_x):
+        """Move the view, baking strips coming into range and dropping far ones"""
+        self.camera_x = camera_x
+        first = (camera_x - self.width // 2) // self.width
+        last = (camera_x + self.width + self.width // 2) // self.width
+        for index in list(self.strips):
+            if not first <= index <= last:
+                del self.strips[index]
+        for index in range(first, last + 1):
+            if index not in self.strips:
+                self.strips[index] = self._bake(index)
+
+    def _bake(self, index):
+        state = self.state
+        left = index * self.width
+        strip = pygame.Surface((self.width, self.height))
+        if pygame.display.get_surface() is not None:
+            strip = strip.convert()
+        platforms = state.platform_grid.query(left, 0, self.width, self.height)
+        obstacles = state.obstacle_grid.query(left, 0, self.width, self.height)
+        draw_static(strip, state.background_color, platforms, obstacles, offset_x=left, texture=self.texture)
+        return strip
+
+    def invalidate(self):
+        self.strips.clear()
+
+    def set_texture(self, texture):
+        """Show or hide the platform texture (strips are baked again as they come into view)"""
+        if texture != self.texture:
+            self.texture = texture
+            self.invalidate()
+
+    def restore(self, window):
+        """Start a frame by painting the strips under the view"""
+        for index in range(self.camera_x // self.width, (self.camera_x + self.width - 1) // self.width + 1):
+            window.blit(self.strips[index], (index * self.width - self.camera_x, 0))
+
+    def add(self, rect):
+        pass  # The whole screen is pushed every frame
+
+    def extend(self, rects):
+        pass
+
+    def update_display(self):
+        pygame.display.update()
+
+
+def draw_enemy(surface, x, y, width, height):
+    """Draw a regular enemy and return its bounding box"""
+    rect = pygame.draw.rect(surface, RED, (x, y, width, height))
+    # Add enemy eyes
+    pygame.draw.circle(surface, WHITE, (x + 8, y + 8), 3)
+    pygame.draw.circle(surface, WHITE, (x + 22, y + 8), 3)
+    pygame.draw.circle(surface, BLACK, (x + 8, y + 8), 1)
+    pygame.draw.circle(surface, BLACK, (x + 22, y + 8), 1)
+    return rect
+
+
+def draw_guardian_enemy(surface, x, y, width, height):
+    """Draw the guardian and return its bounding box (horns included)"""
+    # Guardian body (darker red)
+    pygame.draw.rect(surface, (150, 0, 0), (x, y, width, height))
+    pygame.draw.rect(surface, RED, (x, y, width, height), 2)
+
+    # Guardian eyes (glowing)
+    pygame.draw.circle(surface, (255, 255, 0), (x + 8, y + 8), 4)
+    pygame.draw.circle(surface, (255, 255, 0), (x + 22, y + 8), 4)
+    pygame.draw.circle(surface, BLACK, (x + 8, y + 8), 2)
+    pygame.draw.circle(surface, BLACK, (x + 22, y + 8), 2)
+
+    # Guardian horns
+    pygame.draw.polygon(surface, (100, 0, 0), [(x + 5, y), (x + 10, y - 8), (x + 15, y)])
+    pygame.draw.polygon(surface, (100, 0, 0), [(x + 15, y), (x + 20, y - 8), (x + 25, y)])
+    return pygame.Rect(x, y - 8, width, height + 8)
+
+
+def heart_pulse(ticks):
+    """Extra radius (0-2) of the hearts' pulsing ring at a given time in ms"""
+    return int(2 * abs(ticks % 1000 - 500) / 500)
+
+
+def bucket_sparkle(ticks):
+    """Which of the bucket's four sparkles is lit at a given time in ms"""
+    return (ticks // 300) % 4
+
+
+def coin_sparkle(ticks, phase):
+    """Which of a coin's four sparkles is lit at a given time in ms (phase staggers the coins)"""
+    return (ticks // 200 + phase) % 4
+
+
+def draw_heart(surface, x, y, size=15, pulse_size=None):
+    """Draw a health pickup heart and return its bounding box.
+
+    pulse_size is the pulsing ring's extra radius (see heart_pulse()); with
+    None the ring is left out.
+    """
+    # Heart shape using multiple circles and rectangles
+    # Main heart body
+    pygame.draw.circle(surface, DEEP_RED, (x - size//3, y - size//3), size//3)
+    pygame.draw.circle(surface, DEEP_RED, (x + size//3, y - size//3), size//3)
+
+    # Heart point
+    points = [
+        (x, y + size//2),
+        (x - size//2, y - size//6),
+        (x - size//3, y - size//3),
+        (x, y - size//2),
+        (x + size//3, y - size//3),
+        (x + size//2, y - size//6)
+    ]
+    pygame.draw.polygon(surface, DEEP_RED, points)
+
+    # Bright red center
+    pygame.draw.circle(surface, BRIGHT_RED, (x, y), size//4)
+
+    # White cross symbol
+    pygame.draw.rect(surface, WHITE, (x - 1, y - 4, 2, 8))
+    pygame.draw.rect(surface, WHITE, (x - 4, y - 1, 8, 2))
+
+    # Pulsing effect
+    if pulse_size is not None:
+        pygame.draw.circle(surface, (255, 100, 100), (x, y), size + pulse_size, 2)
+    return pygame.Rect(x - size - 2, y - size - 2, 2 * size + 5, 2 * size + 5)
+
+
+def draw_bucket(surface, x, y, sparkle_offset=None):
+    """Draw the golden bucket with sparkle sparkle_offset (see bucket_sparkle(); None
+    for none) and return its bounding box"""
+    # Bucket body (gold)
+    pygame.draw.rect(surface, GOLD, (x - 15, y, 30, 25))
+    pygame.draw.rect(surface, DARK_GOLD, (x - 15, y, 30, 25), 2)
+
+    # Bucket handle
+    pygame.draw.arc(surface, DARK_GOLD, (x - 20, y - 5, 40, 20), 0, 3.14, 3)
+
+    # Gold sparkles
+    if sparkle_offset == 0:
+        pygame.draw.circle(surface, WHITE, (x - 10, y - 10), 3)
+    elif sparkle_offset == 1:
+        pygame.draw.circle(surface, WHITE, (x + 10, y - 10), 3)
+    elif sparkle_offset == 2:
+        pygame.draw.circle(surface, WHITE, (x - 10, y + 10), 3)
+    elif sparkle_offset == 3:
+        pygame.draw.circle(surface, WHITE, (x + 10, y + 10), 3)
+    return pygame.Rect(x - 20, y - 13, 40, 38)
+
+
+def draw_coin(surface, coin, sparkle_offset=None):
+    """Draw a coin with sparkle sparkle_offset (see coin_sparkle(); None for none)
+    and return its bounding box"""
+    # Main coin
+    rect = pygame.draw.circle(surface, YELLOW, coin, 10)
+    pygame.draw.circle(surface, GOLD, coin, 8)
+    # Sparkle effect
+    if sparkle_offset == 0:
+        pygame.draw.circle(surface, WHITE, (coin[0] - 5, coin[1] - 5), 2)
+    elif sparkle_offset == 1:
+        pygame.draw.circle(surface, WHITE, (coin[0] + 5, coin[1] - 5), 2)
+    elif sparkle_offset == 2:
+        pygame.draw.circle(surface, WHITE, (coin[0] - 5, coin[1] + 5), 2)
+    elif sparkle_offset == 3:
+        pygame.draw.circle(surface, WHITE, (coin[0] + 5, coin[1] + 5), 2)
+    return rect
+
+
+# Animation frames in AnimationAtlas: (frame size, where the entity's (x, y) falls in a frame).
+# Coins and the bucket have four sparkle frames and hearts three pulse sizes,
+# each followed by a still frame used when the effect is turned off
+COIN_FRAMES = ((24, 24), (12, 12))
+HEART_FRAMES = ((36, 36), (18, 18))
+BUCKET_FRAMES = ((41, 38), (20, 13))
+STILL = -1  # Index of the still frame
+
+
+class AnimationAtlas:
+    """Every animation frame of the coins, hearts and bucket, drawn once into one Surface.
+
+    Frames are drawn with draw_coin(), draw_heart() and draw_bucket() when
+    first needed, so they look exactly like the immediate-mode versions.
+    After that each kind of entity goes on screen in a single
+    Surface.blits() call instead of several pygame.draw calls per entity.
+    """
+
+    def __init__(self):
+        self.surface = None
+        self.frames = {}
+
+    def invalidate(self):
+        """Drop the atlas (new display)"""
+        self.surface = None
+        self.frames = {}
+
+    def _build(self):
+        kinds = {
+            "coin": (COIN_FRAMES, [lambda surface, x, y, frame=frame: draw_coin(surface, (x, y), frame)
+                                   for frame in (0, 1, 2, 3, None)]),
+            "heart": (HEART_FRAMES, [lambda surface, x, y, frame=frame: draw_heart(surface, x, y, pulse_size=frame)
+                                     for frame in (0, 1, 2, None)]),
+            "bucket": (BUCKET_FRAMES, [lambda surface, x, y, frame=frame: draw_bucket(surface, x, y, frame)
+                                       for frame in (0, 1, 2, 3, None)]),
+        }
+        # One row of frames per kind
+        width = max(size[0] * len(drawers) for (size, _), drawers in kinds.values())
+        height = sum(size[1] for (size, _), _ in kinds.values())
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        top = 0
+        for kind, ((size, anchor), drawers) in kinds.items():
+            areas = []
+            for i, drawer in enumerate(drawers):
+                area = pygame.Rect(i * size[0], top, size[0], size[1])
+                drawer(self.surface.subsurface(area), anchor[0], anchor[1])
+                areas.append(area)
+            self.frames[kind] = (anchor, areas)
+            top += size[1]
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+    def draw(self, surface, kind, placements):
+        """Blit (x, y, frame) placements of one kind in one batch and return the areas drawn"""
+        if self.surface is None:
+            self._build()
+        atlas = self.surface
+        (anchor_x, anchor_y), areas = self.frames[kind]
+        return surface.blits([(atlas, (x - anchor_x, y - anchor_y), areas[frame]) for x, y, frame in placements])
+
+
+def draw_entities(surface, state, player_pos, enemy_positions, guardian_pos, sprites, atlas, character, dirty_rects,
+                  lap=None, camera_x=0, quality=FULL_QUALITY):
+    """Draw everything that moves or animates, recording each box in dirty_rects.
+
+    Positions come from timing.interpolate() so they can sit between two
+    simulation steps, and are drawn camera_x to the left of where they are
+    in the world. Anything further than CULL_MARGIN outside the view is
+    skipped; coins and hearts are looked up in the spatial grids, so the
+    cost follows what is on screen rather than the size of the level.
+    Coins, hearts and the bucket come out of ``atlas`` (an AnimationAtlas)
+    one batch per kind. ``quality`` says which decorative effects to draw
+    (see quality.py).
+    ``lap`` is called after each draw group when profiling.
+    """
+    view_left = camera_x - CULL_MARGIN
+    view_right = camera_x + surface.get_width() + CULL_MARGIN
+    view_width = view_right - view_left
+    ticks = pygame.time.get_ticks()
+
+    # Draw enemies (ground and platform enemies)
+    enemies = state.enemies
+    enemy_xs, enemy_ys = enemy_positions
+    visible = ((enemy_xs + enemies.width > view_left) & (enemy_xs < view_right)).nonzero()[0]
+    for enemy_x, enemy_y, enemy_width, enemy_height in zip((enemy_xs[visible] - camera_x).astype(int).tolist(),
+                                                           enemy_ys[visible].astype(int).tolist(),
+                                                           enemies.width[visible].tolist(),
+                                                           enemies.height[visible].tolist()):
+        dirty_rects.add(draw_enemy(surface, enemy_x, enemy_y, enemy_width, enemy_height))
+    if lap:
+        lap("draw enemies")
+
+    # Draw guardian enemy
+    guardian_enemy = state.guardian_enemy
+    if guardian_enemy is not None and view_left < guardian_pos[0] < view_right:
+        dirty_rects.add(draw_guardian_enemy(surface, int(guardian_pos[0]) - camera_x, int(guardian_pos[1]),
+                                            guardian_enemy[2], guardian_enemy[3]))
+    if lap:
+        lap("draw guardian")
+
+    # Draw golden bucket (level goal)
+    bucket = state.bucket
+    if bucket is not None and view_left < bucket[0] < view_right:
+        frame = bucket_sparkle(ticks) if quality.sparkles else STILL
+        dirty_rects.extend(atlas.draw(surface, "bucket", [(bucket[0] - camera_x, bucket[1], frame)]))
+    if lap:
+        lap("draw bucket")
+
+    # Draw health pickups (proper red hearts)
+    frame = heart_pulse(ticks) if quality.pulses else STILL
+    dirty_rects.extend(atlas.draw(surface, "heart", [
+        (health_pickup[0] - camera_x, health_pickup[1], frame)
+        for health_pickup in state.pickup_grid.query(view_left, 0, view_width, state.height)]))
+    if lap:
+        lap("draw hearts")
+
+    # Draw coins with sparkle effect (the sparkle phase follows the coin's position)
+    coins = state.coin_grid.query(view_left, 0, view_width, state.height)
+    if quality.sparkles:
+        placements = [(coin[0] - camera_x, coin[1], coin_sparkle(ticks, coin[0] // 50)) for coin in coins]
+    else:
+        placements = [(coin[0] - camera_x, coin[1], STILL) for coin in coins]
+    dirty_rects.extend(atlas.draw(surface, "coin", placements))
+    if lap:
+        lap("draw coins")
+
+    # Draw the player character (with invincibility flash)
+    if state.invincible_timer > 0 and state.invincible_timer % 10 < 5:
+        pass  # Don't draw player when invincible (flashing effect)
+    else:
+        dirty_rects.add(sprites.draw(surface, character, int(player_pos[0]) - camera_x, int(player_pos[1]),
+                                     state.player_width, state.player_height,
+                                     state.power_active and quality.glow))
+    if lap:
+        lap("draw player")
+
+
+def draw_ui(surface, state, level, level_count=MAX_LEVELS):
+    """Draw the user interface elements and return the areas drawn"""
+    drawn = []
+    score = state.score
+    health = state.health
+
+    # Score
+    score_text = render_text(f"Score: {score}", 36, (255, 255, 255))
+    drawn.append(surface.blit(score_text, (10, 10)))
+
+    # Level display (distance run in endless mode)
+    if state.endless:
+        level_text = render_text(f"Endless - {state.distance} m", 36, (255, 255, 255))
+    else:
+        level_text = render_text(f"Level {level}/{level_count}", 36, (255, 255, 255))
+    drawn.append(surface.blit(level_text, (20, 60)))
+
+    # Health bar
+    health_text = render_text(f"Health: {health}", 24, (255, 255, 255))
+    drawn.append(surface.blit(health_text, (10, 90)))
+
+    # Health bar visual
+    bar_width = 200
+    bar_height = 20
+    health_percentage = health / MAX_HEALTH
+    drawn.append(pygame.draw.rect(surface, (255, 0, 0), (10, 120, bar_width, bar_height)))
+    pygame.draw.rect(surface, (0, 255, 0), (10, 120, bar_width * health_percentage, bar_height))
+
+    # Power-up status
+    if state.power_active:
+        power_text = render_text("POWER ACTIVE!", 24, PURPLE)
+        drawn.append(surface.blit(power_text, (220, 90)))
+
+        # Power timer
+        power_seconds = state.power_timer // 60
+        timer_text = render_text(f"Time: {power_seconds}s", 24, PURPLE)
+        drawn.append(surface.blit(timer_text, (220, 120)))
+    else:
+        # Coin progress for power-up
+        coin_text = render_text(f"Coins: {state.coins_collected}/{COINS_FOR_POWER}", 24, GOLD)
+        drawn.append(surface.blit(coin_text, (220, 90)))
+
+        if state.coins_collected >= COINS_FOR_POWER:
+            power_hint = render_text("Press P to activate power!", 24, PURPLE)
+            drawn.append(surface.blit(power_hint, (220, 120)))
+        else:
+            power_hint = render_text("Collect 5 coins for power!", 24, PURPLE)
+            drawn.append(surface.blit(power_hint, (220, 120)))
+
+    # Health pickup indicator
+    if health < MAX_HEALTH:
+        pickup_text = render_text("Find red hearts to restore health!", 24, (255, 50, 50))
+        drawn.append(surface.blit(pickup_text, (220, 150)))
+
+    # Goal indicator
+    if state.endless:
+        goal_text = render_text("Run as far as you can!", 24, GOLD)
+    else:
+        goal_text = render_text("Collect the golden bucket to win!", 24, GOLD)
+    drawn.append(surface.blit(goal_text, (220, 180)))
+    return drawn
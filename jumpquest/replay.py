@@ -0,0 +1,179 @@
+"""Compact input recordings and a max-speed headless replay.
+
+A recording holds everything needed to re-run a level exactly: the level
+(0 for an endless run), screen size, seed, starting health and level width
+in screens, followed by the per-step inputs run-length encoded as
+(bitmask, count) pairs. Because the engine is deterministic, replaying
+those inputs through step() with no window and no frame cap reproduces the
+original session bit for bit.
+
+Usage: python -m jumpquest.replay RECORDING [RECORDING ...]
+"""
+
+import os
+import struct
+import sys
+import time
+
+from .endless import ENDLESS_LEVEL, EndlessState
+from .engine import GameState, Inputs, step
+
+MAGIC = b"JQRP"
+VERSION = 2
+HEADER = struct.Struct("<4sBHHHqhB")  # magic, version, level, width, height, seed, health, screens
+HEADER_V1 = struct.Struct("<4sBHHHqh")  # Version 1 had no screens field (every level was one screen)
+RUN = struct.Struct("<BH")           # input bitmask, repeat count
+MAX_RUN = 0xFFFF
+
+RECORDINGS_DIR = "recordings"
+
+# Input bits
+LEFT = 1
+RIGHT = 2
+SPACE = 4
+P = 8
+ESC = 16
+
+
+def encode_inputs(inputs, escape=False):
+    """Pack one frame of input into a bitmask"""
+    return ((LEFT if inputs.left else 0) | (RIGHT if inputs.right else 0) |
+            (SPACE if inputs.jump else 0) | (P if inputs.power else 0) |
+            (ESC if escape else 0))
+
+
+def decode_inputs(mask):
+    """Unpack a bitmask into (Inputs, escape)"""
+    return Inputs(bool(mask & LEFT), bool(mask & RIGHT), bool(mask & SPACE), bool(mask & P)), bool(mask & ESC)
+
+
+class InputRecorder:
+    """Record the inputs fed to one level, run-length encoded as they come in"""
+
+    def __init__(self, state):
+        self.level = state.level
+        self.width = state.width
+        self.height = state.height
+        self.seed = state.seed
+        self.health = state.health
+        self.screens = state.screens
+        self.runs = []
+        self._mask = None
+        self._count = 0
+
+    def record(self, inputs, escape=False):
+        """Record the inputs of one simulation step (escape ends the session)"""
+        mask = encode_inputs(inputs, escape)
+        if mask == self._mask and self._count < MAX_RUN:
+            self._count += 1
+        else:
+            if self._count:
+                self.runs.append((self._mask, self._count))
+            self._mask = mask
+            self._count = 1
+
+    def to_bytes(self):
+        runs = self.runs + ([(self._mask, self._count)] if self._count else [])
+        header = HEADER.pack(MAGIC, VERSION, self.level, self.width, self.height, self.seed, self.health,
+                             self.screens)
+        return header + b"".join(RUN.pack(mask, count) for mask, count in runs)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    def save_to_dir(self, directory=RECORDINGS_DIR):
+        """Save under a timestamped name and return the path (None if saving failed)"""
+        path = os.path.join(directory, f"level-{self.level}-{time.strftime('%Y%m%d-%H%M%S')}.jqr")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self.save(path)
+        except OSError:
+            return None
+        return path
+
+
+class Replay:
+    """A loaded recording"""
+
+    def __init__(self, level, width, height, seed, health, runs, screens=1):
+        self.level = level
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.health = health
+        self.screens = screens
+        self.runs = runs
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version = HEADER_V1.unpack_from(data)[:2]
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError("not a Jump Quest recording (or an unsupported version)")
+        if version == 1:
+            header = HEADER_V1
+            _, _, level, width, height, seed, health = header.unpack_from(data)
+            screens = 1
+        else:
+            header = HEADER
+            _, _, level, width, height, seed, health, screens = header.unpack_from(data)
+        body = memoryview(data)[header.size:]
+        runs = list(RUN.iter_unpack(body))
+        return cls(level, width, height, seed, health, runs, screens)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def __len__(self):
+        return sum(count for _, count in self.runs)
+
+    def frames(self):
+        """Yield (Inputs, escape) for every recorded step"""
+        for mask, count in self.runs:
+            frame = decode_inputs(mask)
+            for _ in range(count):
+                yield frame
+
+    def new_state(self):
+        """A fresh GameState for the recorded level (or endless run)"""
+        if self.level == ENDLESS_LEVEL:
+            return EndlessState(self.width, self.height, health=self.health, seed=self.seed)
+        return GameState(self.level, self.width, self.height, health=self.health, seed=self.seed,
+                         screens=self.screens)
+
+
+def run_replay(replay):
+    """Feed a recording through the engine as fast as possible.
+
+    Returns (result, state): result is what step() returned last, "quit" if
+    the player pressed ESC, or None if the recording simply ran out.
+    """
+    state = replay.new_state()
+    for inputs, escape in replay.frames():
+        if escape:
+            return "quit", state
+        result = step(state, inputs)
+        if result is not None:
+            return result, state
+    return None, state
+
+
+def main(argv=None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    for path in paths:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        result, state = run_replay(replay)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: level {replay.level} -> {result}  frames: {state.frame}  "
+              f"score: {state.score}  health: {state.health}  ({elapsed * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Uniform-grid spatial hash used as the collision broadphase.
+
+Entities are bucketed by the grid cells their box overlaps. A query only
+looks at the cells under the query box, so the cost of a collision pass
+depends on what is near the player rather than on how many entities the
+level holds. Items are the entity lists themselves; results come back in
+insertion order so collision responses resolve in the same order as a
+plain loop over the level lists would.
+"""
+
+DEFAULT_CELL_SIZE = 128
+
+
+class SpatialHash:
+    """Grid of cell -> items for fast "what is near this box" queries"""
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}  # id(item) -> [item, insertion order, cell span]
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _span(self, x, y, width, height):
+        size = self.cell_size
+        return (int(x // size), int(y // size),
+                int((x + max(width, 1) - 1) // size), int((y + max(height, 1) - 1) // size))
+
+    def _add_to_cells(self, key, span):
+        x0, y0, x1, y1 = span
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = {key}
+                else:
+                    bucket.add(key)
+
+    def _remove_from_cells(self, key, span):
+        x0, y0, x1, y1 = span
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def insert(self, item, x, y, width, height):
+        """Add an item covering the given box"""
+        key = id(item)
+        span = self._span(x, y, width, height)
+        self.entries[key] = [item, self._next_order, span]
+        self._next_order += 1
+        self._add_to_cells(key, span)
+
+    def remove(self, item):
+        """Take an item out of the grid (no-op if it isn't there)"""
+        entry = self.entries.pop(id(item), None)
+        if entry is not None:
+            self._remove_from_cells(id(item), entry[2])
+
+    def query(self, x, y, width, height):
+        """Return the items in the cells under the box, in insertion order"""
+        x0, y0, x1, y1 = self._span(x, y, width, height)
+        cells = self.cells
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        if not found:
+            return []
+        entries = self.entries
+        if len(found) == 1:
+            return [entries[found.pop()][0]]
+        return [entry[0] for entry in sorted((entries[key] for key in found), key=lambda entry: entry[1])]
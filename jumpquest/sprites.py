@@ -0,0 +1,143 @@
+"""Pre-rendered character sprites.
+
+Each character is drawn with pygame.draw once per power state into its own
+transparent Surface, so putting the player on screen costs a single blit.
+"""
+
+import pygame
+
+from .colors import BLACK, BLUE, BROWN, LIGHT_PURPLE, PURPLE, RED, SKIN, WHITE
+
+CHARACTERS = ("mario", "doraemon", "heman")
+
+# Room around the player box for the glow, arms, hat and cape
+SPRITE_PADDING = 8
+GLOW_SIZE = 5
+
+
+def draw_mario(surface, x, y, width, height, power_active=False):
+    # Draw power-up glow effect
+    if power_active:
+        # Purple glow around Mario
+        glow_size = GLOW_SIZE
+        pygame.draw.rect(surface, LIGHT_PURPLE, (x - glow_size, y - glow_size, width + glow_size*2, height + glow_size*2))
+        pygame.draw.rect(surface, PURPLE, (x - glow_size, y - glow_size, width + glow_size*2, height + glow_size*2), 2)
+
+    # Mario's body (red shirt)
+    pygame.draw.rect(surface, RED, (x, y + height//3, width, height//2))
+
+    # Mario's overalls (blue)
+    pygame.draw.rect(surface, BLUE, (x, y + height//2, width, height//3))
+
+    # Mario's head (skin color)
+    pygame.draw.rect(surface, SKIN, (x, y, width, height//3))
+
+    # Mario's hat (red)
+    pygame.draw.rect(surface, RED, (x - 2, y, width + 4, height//6))
+
+    # Mario's eyes (white)
+    pygame.draw.circle(surface, WHITE, (x + width//4, y + height//6), 3)
+    pygame.draw.circle(surface, WHITE, (x + 3*width//4, y + height//6), 3)
+
+    # Mario's pupils (black)
+    pygame.draw.circle(surface, BLACK, (x + width//4, y + height//6), 1)
+    pygame.draw.circle(surface, BLACK, (x + 3*width//4, y + height//6), 1)
+
+    # Mario's mustache (brown)
+    pygame.draw.rect(surface, BROWN, (x + width//4, y + height//3 - 2, width//2, 4))
+
+    # Mario's arms (skin color)
+    pygame.draw.rect(surface, SKIN, (x - 5, y + height//3, 8, height//4))
+    pygame.draw.rect(surface, SKIN, (x + width - 3, y + height//3, 8, height//4))
+
+
+def draw_doraemon(surface, x, y, width, height, power_active=False):
+    # Draw power-up glow effect
+    if power_active:
+        # Purple glow around Doraemon
+        glow_size = GLOW_SIZE
+        pygame.draw.ellipse(surface, LIGHT_PURPLE, (x - glow_size, y - glow_size, width + glow_size*2, height + glow_size*2))
+        pygame.draw.ellipse(surface, PURPLE, (x - glow_size, y - glow_size, width + glow_size*2, height + glow_size*2), 2)
+
+    # Body (blue)
+    pygame.draw.ellipse(surface, (0, 162, 232), (x, y + height//4, width, height//2))
+    # Head (white face, blue outline)
+    pygame.draw.ellipse(surface, (0, 162, 232), (x, y, width, height//2))
+    pygame.draw.ellipse(surface, (255, 255, 255), (x + 4, y + 4, width - 8, height//2 - 8))
+    # Eyes
+    pygame.draw.circle(surface, (255, 255, 255), (x + width//3, y + height//6), 5)
+    pygame.draw.circle(surface, (255, 255, 255), (x + 2*width//3, y + height//6), 5)
+    pygame.draw.circle(surface, (0, 0, 0), (x + width//3, y + height//6), 2)
+    pygame.draw.circle(surface, (0, 0, 0), (x + 2*width//3, y + height//6), 2)
+    # Nose (red)
+    pygame.draw.circle(surface, (255, 0, 0), (x + width//2, y + height//4), 3)
+    # Collar (red)
+    pygame.draw.rect(surface, (255, 0, 0), (x, y + height//2 - 4, width, 4))
+
+
+def draw_heman(surface, x, y, width, height, power_active=False):
+    # Draw power-up glow effect
+    if power_active:
+        # Purple glow around He-Man
+        glow_size = GLOW_SIZE
+        pygame.draw.rect(surface, LIGHT_PURPLE, (x - glow_size, y - glow_size, width + glow_size*2, height + glow_size*2))
+        pygame.draw.rect(surface, PURPLE, (x - glow_size, y - glow_size, width + glow_size*2, height + glow_size*2), 2)
+
+    # Body (blue armor)
+    pygame.draw.rect(surface, (0, 100, 200), (x, y + height//3, width, height//2))
+    # Head (skin color)
+    pygame.draw.ellipse(surface, SKIN, (x, y, width, height//3))
+    # Hair (brown)
+    pygame.draw.ellipse(surface, (139, 69, 19), (x - 2, y, width + 4, height//3))
+    # Eyes
+    pygame.draw.circle(surface, (0, 0, 0), (x + width//3, y + height//6), 2)
+    pygame.draw.circle(surface, (0, 0, 0), (x + 2*width//3, y + height//6), 2)
+    # Mustache
+    pygame.draw.rect(surface, (139, 69, 19), (x + width//4, y + height//3 - 2, width//2, 4))
+    # Cape (red)
+    pygame.draw.rect(surface, (200, 0, 0), (x + width - 5, y + height//3, 8, height//2))
+
+
+CHARACTER_DRAWERS = {
+    "mario": draw_mario,
+    "doraemon": draw_doraemon,
+    "heman": draw_heman,
+}
+
+
+def render_character(character, width, height, power_active=False):
+    """Draw a character once into a transparent Surface padded by SPRITE_PADDING"""
+    surface = pygame.Surface((width + SPRITE_PADDING * 2, height + SPRITE_PADDING * 2), pygame.SRCALPHA)
+    CHARACTER_DRAWERS[character](surface, SPRITE_PADDING, SPRITE_PADDING, width, height, power_active)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
+
+
+class CharacterSpriteCache:
+    """Sprites for one character, one per power state, built on first use"""
+
+    def __init__(self):
+        self.character = None
+        self.sprites = {}
+
+    def invalidate(self):
+        """Drop every cached sprite (new character or new display)"""
+        self.character = None
+        self.sprites.clear()
+
+    def get(self, character, width, height, power_active=False):
+        if character != self.character:
+            self.invalidate()
+            self.character = character
+        key = (width, height, bool(power_active))
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = render_character(character, width, height, power_active)
+            self.sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, character, x, y, width, height, power_active=False):
+        """Blit the character with its top-left player corner at (x, y); returns the drawn Rect"""
+        sprite = self.get(character, width, height, power_active)
+        return surface.blit(sprite, (x - SPRITE_PADDING, y - SPRITE_PADDING))
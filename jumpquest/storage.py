@@ -0,0 +1,20 @@
+"""Crash-safe JSON files."""
+
+import json
+import os
+
+
+def write_json(path, data, **dump_options):
+    """Write data as JSON through a temp file and os.replace(), so a crash
+    mid-write never leaves a half-written file at path. Raises OSError."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, **dump_options)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
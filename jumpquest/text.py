@@ -0,0 +1,35 @@
+"""Font registry and rendered-text cache.
+
+Fonts are built once per size and rendered strings are kept in an LRU keyed
+by (string, size, color), so HUD text is only rendered again when the value
+it shows changes.
+"""
+
+import functools
+
+import pygame
+
+TEXT_CACHE_SIZE = 256
+
+_fonts = {}
+
+
+def get_font(size):
+    """Return the shared default font at the given size"""
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text, size, color):
+    """Render antialiased text; the returned Surface is shared, don't draw on it"""
+    return get_font(size).render(text, True, color)
+
+
+def clear_text_cache():
+    """Forget every font and rendered string (after pygame.quit() they are invalid)"""
+    _fonts.clear()
+    render_text.cache_clear()
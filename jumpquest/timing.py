@@ -0,0 +1,119 @@
+"""Fixed-timestep scheduling, render interpolation and frame pacing stats.
+
+The simulation always advances in steps of ``STEP_DT`` (the 60 FPS the game
+rules were written for) no matter how fast frames are drawn. Drawing happens
+as often as the display allows and blends positions between the last two
+steps so motion stays smooth on 120/144 Hz panels. Drawing is capped at
+the refresh rate (by vsync where the display grants it, otherwise at 60 Hz
+unless told otherwise) so no fill-rate is spent on frames the display never
+shows.
+"""
+
+from collections import deque
+
+STEP_RATE = 60  # Simulation steps per second
+STEP_DT = 1.0 / STEP_RATE
+MAX_STEPS_PER_FRAME = 5  # Drop time instead of spiralling after a long stall
+RENDER_FPS_CAP = 240  # Upper bound for drawing, well above common refresh rates
+DEFAULT_FPS_CAP = 60  # Frames beyond the display's refresh rate are never seen, only paid for
+FRAME_BUDGET = 1.0 / 60  # 16.6 ms
+TICK_RESOLUTION = 0.001  # clock.tick() counts whole milliseconds, so a 60 FPS frame reads 16 or 17 ms
+VSYNC_PROBE_FLIPS = 30  # Flips timed at startup to check that vsync really paces them
+MIN_VSYNC_INTERVAL = 0.8 / RENDER_FPS_CAP  # A flip that waits for the vertical blank takes at least about this long
+
+
+class FixedTimestep:
+    """Accumulate real frame time and hand it out as whole simulation steps"""
+
+    def __init__(self, step_dt=STEP_DT, max_steps=MAX_STEPS_PER_FRAME):
+        self.step_dt = step_dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, frame_time):
+        """Add frame_time seconds and return how many steps to run now"""
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.step_dt)
+        if steps > self.max_steps:
+            # Too far behind - run what we can and forget the rest
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_dt
+        return steps
+
+    @property
+    def alpha(self):
+        """How far (0.0 - 1.0) the current frame is between the last two steps"""
+        return min(1.0, self.accumulator / self.step_dt)
+
+
+def snapshot_positions(state):
+    """Record the positions that get interpolated when drawing, plus the
+    enemy generation they belong to"""
+    guardian = state.guardian_enemy
+    return (
+        (state.player_x, state.player_y),
+        state.enemies.positions(),
+        (guardian[0], guardian[1]) if guardian is not None else None,
+        state.enemies.generation,
+    )
+
+
+def interpolate(previous, current, alpha):
+    """Blend two snapshot_positions() results, alpha=0 gives previous.
+
+    Returns (player, enemies, guardian) positions.
+    """
+    def lerp(a, b):
+        return (a[0] + (b[0] - a[0]) * alpha, a[1] + (b[1] - a[1]) * alpha)
+
+    prev_player, prev_enemies, prev_guardian, prev_generation = previous
+    player, enemies, guardian, generation = current
+    if prev_generation != generation:
+        # Enemies were streamed in or out: the same index may be another enemy
+        prev_enemies = enemies
+    # Enemy positions are arrays, so this blends all of them at once
+    return (
+        lerp(prev_player, player),
+        lerp(prev_enemies, enemies),
+        lerp(prev_guardian, guardian) if guardian is not None else None,
+    )
+
+
+class FrameStats:
+    """Rolling window of frame times with percentile reporting"""
+
+    def __init__(self, window=600, budget=FRAME_BUDGET):
+        self.frame_times = deque(maxlen=window)
+        self.budget = budget
+        self.frames = 0
+        self.missed = 0
+
+    def record(self, frame_time):
+        """Record one frame time in seconds"""
+        self.frame_times.append(frame_time)
+        self.frames += 1
+        if frame_time > self.budget + TICK_RESOLUTION:
+            self.missed += 1
+
+    def percentile(self, p):
+        """Frame time in seconds at percentile p (0-100) of the current window"""
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def p50(self):
+        return self.percentile(50)
+
+    @property
+    def p99(self):
+        return self.percentile(99)
+
+    def report(self):
+        """One-line summary of frame pacing"""
+        return (f"frames: {self.frames}  p50: {self.p50 * 1000:.1f} ms  "
+                f"p99: {self.p99 * 1000:.1f} ms  over budget: {self.missed}")
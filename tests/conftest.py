@@ -0,0 +1,9 @@
+import pytest
+
+from jumpquest import levels
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    """Keep generated levels in memory instead of writing level_cache/"""
+    monkeypatch.setattr(levels, "LEVEL_CACHE_DIR", None)
@@ -0,0 +1,70 @@
+import pytest
+
+from jumpquest.engine import BORDER, GAME_OVER, LEVEL_COMPLETE, GameState, Inputs, step, update_enemies
+from jumpquest.entities import COARSE_INTERVAL
+
+
+def scripted_inputs(frame):
+    """Mostly run right, back off now and then, jump and use the power regularly"""
+    return Inputs(frame % 97 < 30, frame % 97 >= 30, frame % 23 == 0, frame % 50 == 0)
+
+
+def play(state, max_frames=3000):
+    result = None
+    for frame in range(max_frames):
+        result = step(state, scripted_inputs(frame))
+        if result is not None:
+            break
+    return result
+
+
+# (level, width, height) -> (result, frames, health, score)
+KNOWN_OUTCOMES = {
+    (1, 1280, 720): (GAME_OVER, 699, -10, 0),
+    (4, 1920, 1080): (LEVEL_COMPLETE, 639, 80, 0),
+    (9, 1280, 720): (LEVEL_COMPLETE, 483, 50, 30),
+    (12, 1920, 1080): (LEVEL_COMPLETE, 1665, 70, 60),
+    (20, 1280, 720): (LEVEL_COMPLETE, 793, 80, 90),
+    (33, 1920, 1080): (GAME_OVER, 350, 0, 0),
+    (50, 1920, 1080): (GAME_OVER, 2876, 0, 160),
+}
+
+
+@pytest.mark.parametrize("level, width, height", sorted(KNOWN_OUTCOMES))
+def test_step_known_outcomes(level, width, height):
+    state = GameState(level, width, height)
+    result = play(state)
+    assert (result, state.frame, state.health, state.score) == KNOWN_OUTCOMES[level, width, height]
+
+
+def test_step_is_deterministic():
+    first, second = GameState(12, 1280, 720), GameState(12, 1280, 720)
+    for frame in range(600):
+        inputs = scripted_inputs(frame)
+        assert step(first, inputs) == step(second, inputs)
+        assert (first.player_x, first.player_y, first.health, first.score) == \
+            (second.player_x, second.player_y, second.health, second.score)
+        assert first.enemies.x.tolist() == second.enemies.x.tolist()
+        assert first.enemies.y.tolist() == second.enemies.y.tolist()
+
+
+@pytest.mark.parametrize("level, seed", [(6, 0), (8, 2), (9, 2), (12, 3), (14, 0)])
+def test_enemies_get_back_in_bounds_after_coarse_steps(level, seed):
+    """Far-off enemies move several frames at once and may overshoot a wall,
+    but must be back inside their patrol area as they come into view"""
+    state = GameState(level, 1280, 720, seed=seed, screens=4)
+    enemies = state.enemies
+    span = state.world_width - state.width
+    out_for = {i: 0 for i in enemies.horizontal.tolist() + enemies.vertical.tolist()}
+    for frame in range(4000):
+        # Sweep the view across the level and back, twice
+        sweep = frame % 2000
+        state.player_x = 50 + span * min(sweep, 2000 - sweep) // 1000
+        state.frame = frame
+        update_enemies(state)
+        for i in out_for:
+            x, y = enemies.x[i], enemies.y[i]
+            out = (x < enemies.min_x[i] or x > enemies.max_x[i] - enemies.width[i] or
+                   y < BORDER or y > state.height - BORDER - enemies.height[i])
+            out_for[i] = out_for[i] + 1 if out else 0
+            assert out_for[i] <= COARSE_INTERVAL, f"enemy {i} out of bounds at frame {frame}"
@@ -0,0 +1,89 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from jumpquest.env import NUM_ACTIONS, OBS_SIZE, JumpQuestEnv, VectorEnv
+
+LEVELS = [1, 5, 12]
+SEEDS = [3, 4, 5]
+MAX_STEPS = 40  # Short enough that every episode is cut off and reset during the test
+
+
+def reference_envs(seeds=SEEDS):
+    envs = [JumpQuestEnv(level, seed=seed, max_steps=MAX_STEPS) for level, seed in zip(LEVELS, seeds)]
+    observations = np.stack([env.reset()[0] for env in envs])
+    return envs, observations
+
+
+def step_by_hand(envs, actions):
+    """Step every env like VectorEnv does: finished episodes report their info and start again"""
+    observations, rewards, terminated, truncated, infos = [], [], [], [], []
+    for i, (env, action) in enumerate(zip(envs, actions)):
+        obs, reward, done, cut, info = env.step(action)
+        if done or cut:
+            infos.append((i, info))
+            obs, _ = env.reset()
+        observations.append(obs)
+        rewards.append(reward)
+        terminated.append(done)
+        truncated.append(cut)
+    return np.stack(observations), np.float32(rewards), np.array(terminated), np.array(truncated), infos
+
+
+@pytest.fixture
+def vector_env():
+    envs = VectorEnv(3, level=LEVELS, seeds=SEEDS, workers=2, max_steps=MAX_STEPS)
+    yield envs
+    envs.close()
+
+
+def test_vector_env_matches_envs_stepped_by_hand(vector_env):
+    envs, expected_obs = reference_envs()
+    observations, infos = vector_env.reset()
+    assert observations.shape == (3, OBS_SIZE)
+    np.testing.assert_array_equal(observations, expected_obs)
+    assert infos == [{"seed": seed} for seed in SEEDS]
+
+    rng = np.random.default_rng(0)
+    finished = 0
+    for _ in range(2 * MAX_STEPS + 5):
+        actions = rng.integers(0, NUM_ACTIONS, size=3)
+        expected = step_by_hand(envs, actions)
+        got = vector_env.step(actions)
+        for got_array, expected_array in zip(got[:4], expected[:4]):
+            np.testing.assert_array_equal(got_array, expected_array)
+        assert got[4] == expected[4]
+        finished += len(got[4])
+    assert finished >= 2 * len(LEVELS)  # Every env ended and came back reset at least twice
+
+
+def test_ended_episode_comes_back_reset(vector_env):
+    first_obs, _ = vector_env.reset()
+    for _ in range(MAX_STEPS - 1):
+        _, _, _, truncated, infos = vector_env.step(np.zeros(3))
+        assert not truncated.any() and infos == []
+    observations, _, terminated, truncated, infos = vector_env.step(np.zeros(3))
+    assert truncated.all() and not terminated.any()
+    assert [i for i, _ in infos] == [0, 1, 2]
+    assert all(info["frames"] == MAX_STEPS for _, info in infos)
+    np.testing.assert_array_equal(observations, first_obs)
+
+
+def test_reset_seeds_each_env(vector_env):
+    seeds = [10, 11, 12]
+    _, expected_obs = reference_envs(seeds)
+    observations, infos = vector_env.reset(seeds)
+    np.testing.assert_array_equal(observations, expected_obs)
+    assert infos == [{"seed": seed} for seed in seeds]
+
+
+def test_close_stops_workers_and_unlinks_memory():
+    envs = VectorEnv(3, workers=2)
+    names = [block.name for block in envs._blocks]
+    processes = envs._processes
+    envs.close()
+    assert not any(process.is_alive() for process in processes)
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from jumpquest import progress
+from jumpquest.progress import SCHEMA_VERSION, ProgressStore, migrate
+
+
+@pytest.fixture
+def save_path(tmp_path):
+    return str(tmp_path / "progress.json")
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Count the files the writer thread saves"""
+    paths = []
+
+    def counting_write_json(path, data, **dump_options):
+        paths.append(path)
+        real_write_json(path, data, **dump_options)
+
+    real_write_json = progress.write_json
+    monkeypatch.setattr(progress, "write_json", counting_write_json)
+    return paths
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_migrate_upgrades_version_1():
+    data = migrate({"highest_unlocked_level": 7})
+    assert data == {"version": SCHEMA_VERSION, "highest_unlocked_level": 7, "levels": {}}
+
+
+def test_store_reads_and_upgrades_version_1_file(save_path):
+    with open(save_path, "w") as f:
+        json.dump({"highest_unlocked_level": 4}, f)
+    store = ProgressStore(save_path)
+    assert store.highest_unlocked_level == 4
+    assert store.level_stats(2) == progress.new_level_stats()
+    store.close()
+
+
+def test_changes_coalesce_into_one_write(save_path, writes):
+    store = ProgressStore(save_path, save_delay=60)  # Only flush() ends the wait
+    store.unlock(2)
+    store.record_death(1)
+    store.record_completion(1, 120, 33.333)
+    store.flush()
+    assert writes == [save_path]
+    store.close()
+    assert writes == [save_path]  # Nothing was left to save
+
+
+def test_flush_leaves_complete_file(save_path):
+    store = ProgressStore(save_path, save_delay=60)
+    store.record_completion(3, 50, 20.0)
+    store.record_completion(3, 80, 25.0)
+    store.record_death(3)
+    store.unlock(4)
+    store.flush()
+    data = load(save_path)
+    assert data["version"] == SCHEMA_VERSION
+    assert data["highest_unlocked_level"] == 4
+    assert data["levels"]["3"] == {"best_score": 80, "best_time": 20.0, "deaths": 1, "completions": 2}
+    store.close()
+
+
+def test_close_saves_pending_changes(save_path):
+    store = ProgressStore(save_path, save_delay=60)
+    store.unlock(9)
+    store.close()
+    assert load(save_path)["highest_unlocked_level"] == 9
+
+
+def test_partial_level_entry_is_filled_in(save_path):
+    with open(save_path, "w") as f:
+        json.dump({"version": SCHEMA_VERSION, "levels": {"3": {"deaths": 1}}}, f)
+    store = ProgressStore(save_path)
+    assert store.level_stats(3)["completions"] == 0
+    store.record_completion(3, 40, 12.5)
+    assert store.level_stats(3) == {"best_score": 40, "best_time": 12.5, "deaths": 1, "completions": 1}
+    store.close()
@@ -0,0 +1,63 @@
+import pytest
+
+from jumpquest.endless import ENDLESS_LEVEL, EndlessState
+from jumpquest.engine import GameState, step
+from jumpquest.replay import InputRecorder, Replay, run_replay
+
+from test_engine import scripted_inputs
+
+
+def record(state, max_frames=3000, escape_at=None):
+    """Play state with the scripted inputs, recording them; returns (result, recording bytes)"""
+    recorder = InputRecorder(state)
+    result = None
+    for frame in range(max_frames):
+        if frame == escape_at:
+            recorder.record(scripted_inputs(frame), escape=True)
+            result = "quit"
+            break
+        recorder.record(scripted_inputs(frame))
+        result = step(state, scripted_inputs(frame))
+        if result is not None:
+            break
+    return result, recorder.to_bytes()
+
+
+def snapshot(state):
+    return state.frame, state.score, state.health, state.player_x, state.player_y
+
+
+@pytest.mark.parametrize("level, screens", [(1, 1), (12, 1), (40, 1), (20, 3)])
+def test_replay_reproduces_level(level, screens):
+    state = GameState(level, 1280, 720, seed=7, screens=screens)
+    result, data = record(state)
+    replay = Replay.from_bytes(data)
+    assert (replay.level, replay.seed, replay.screens) == (level, 7, screens)
+    replayed_result, replayed = run_replay(replay)
+    assert replayed_result == result
+    assert snapshot(replayed) == snapshot(state)
+
+
+def test_replay_reproduces_endless_run():
+    state = EndlessState(1280, 720, seed=3)
+    result, data = record(state)
+    replay = Replay.from_bytes(data)
+    assert replay.level == ENDLESS_LEVEL
+    replayed_result, replayed = run_replay(replay)
+    assert replayed_result == result
+    assert snapshot(replayed) == snapshot(state)
+    assert replayed.distance == state.distance
+
+
+def test_replay_stops_at_escape():
+    state = GameState(5, 1280, 720)
+    result, data = record(state, escape_at=200)
+    assert result == "quit"
+    replayed_result, replayed = run_replay(Replay.from_bytes(data))
+    assert replayed_result == "quit"
+    assert snapshot(replayed) == snapshot(state)
+
+
+def test_from_bytes_rejects_other_files():
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b"PK\x03\x04" + bytes(40))